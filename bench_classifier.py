@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for line classification over cached page text
+Compares the original per-line re.search/re.match sequence with the
+precompiled LineClassifier and reports lines/sec for each
+"""
+
+import argparse
+import re
+import time
+
+from line_classifier import STATS_CLASSIFIER, REGION_HEADER, COUNCIL_HEADER, NOISE, clean_text, split_council_name
+from page_cache import PageCache, default_cache_path
+
+def legacy_classify(line, next_line, region_name, council_name):
+    """The population-stats parser's original checks, patterns rebuilt on every line"""
+    combined = line
+    if next_line is not None:
+        combined = line + " " + next_line
+
+    region_match = re.search(r'by\s+Council[,\s]+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
+    if not region_match:
+        region_match = re.search(r'Council\s+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
+    if region_match:
+        return REGION_HEADER, region_match
+
+    if region_name:
+        region_stats = re.match(r'^' + re.escape(region_name) + r'\s+Region\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line)
+        if region_stats:
+            return 'region_stats', region_stats
+
+    council_section = re.match(r'^\d+\.\s*\d+\s+([A-Z][A-Z\s\'\-]+(?:DISTRICT|MUNICIPAL|TOWN|CITY)\s+COUNCIL)', line)
+    if council_section:
+        return COUNCIL_HEADER, council_section
+
+    if council_name:
+        council_stats = re.match(r'^' + re.escape(council_name) + r'\s+(?:District|Municipal|Town|City)?\s*(?:Council)?\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line, re.IGNORECASE)
+        if council_stats:
+            return 'council_stats', council_stats
+
+    ward_match = re.match(r'^(\d+)\.\s+([A-Z][a-zA-Z\s\'\-]+?)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line)
+    if ward_match:
+        return 'ward_row', ward_match
+
+    return NOISE, None
+
+def build_workload(page_texts):
+    """
+    Flatten pages into (line, next_line, region_name, council_name) tuples
+    Region/council context is tracked the way the parser tracks it
+    """
+    workload = []
+    region_name = None
+    council_name = None
+    for text in page_texts:
+        if not text:
+            continue
+        lines = text.split('\n')
+        for i, raw_line in enumerate(lines):
+            line = raw_line.strip()
+            if not line:
+                continue
+            next_line = lines[i + 1].strip() if i + 1 < len(lines) else None
+            workload.append((line, next_line, region_name, council_name))
+            kind, match = STATS_CLASSIFIER.classify(line, next_line, region_name, council_name)
+            if kind == REGION_HEADER:
+                region_name = clean_text(match.group(1))
+                council_name = None
+            elif kind == COUNCIL_HEADER:
+                council_name = split_council_name(clean_text(match.group(1)))[1]
+    return workload
+
+def time_classifier(classify, workload, repeat):
+    """Return the best lines/sec over `repeat` runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line, next_line, region_name, council_name in workload:
+            classify(line, next_line, region_name, council_name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(workload) / best if best else float('inf')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark line classification on cached page text")
+    parser.add_argument('--pdf', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf')
+    parser.add_argument('--cache', help='Page-text cache file (default: next to the PDF)')
+    parser.add_argument('--start-page', type=int, default=54)
+    parser.add_argument('--end-page', type=int, default=286)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cache = PageCache(args.cache or default_cache_path(args.pdf), args.pdf)
+    pages = cache.get_pages(args.start_page, args.end_page)
+    cache.close()
+    if not pages:
+        print("No cached pages found; run an extraction script first to fill the cache")
+        return
+
+    workload = build_workload(pages[n] for n in sorted(pages))
+
+    # Both classifiers must agree on every line before their speed is compared
+    for line, next_line, region_name, council_name in workload:
+        expected = legacy_classify(line, next_line, region_name, council_name)[0]
+        actual = STATS_CLASSIFIER.classify(line, next_line, region_name, council_name)[0]
+        if expected != actual:
+            raise SystemExit(f"Classifier mismatch on {line!r}: {expected} != {actual}")
+
+    legacy_rate = time_classifier(legacy_classify, workload, args.repeat)
+    table_rate = time_classifier(STATS_CLASSIFIER.classify, workload, args.repeat)
+
+    print(f"Pages: {len(pages)}, lines: {len(workload):,}")
+    print(f"Per-line re.search/re.match: {legacy_rate:,.0f} lines/sec")
+    print(f"Precompiled LineClassifier:  {table_rate:,.0f} lines/sec")
+    print(f"Speedup: {table_rate / legacy_rate:.1f}x")
+
+if __name__ == '__main__':
+    main()
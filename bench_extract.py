@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Reproducible extractor benchmark on synthetic census PDFs
+Generates a report from population_stats.json at each scale (1x, 10x, 100x
+by default), unless it is already in the work directory, then times extract_administrative_units and
+extract_population_stats on it without the page cache, so results can be
+compared across machines and commits
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+from extract_admin_units import extract_administrative_units
+from extract_population_stats import extract_population_stats
+from pdf_pages import count_pages
+from synthetic_pdf import FRONT_MATTER_PAGES, generate
+
+def count_wards(data, units_key):
+    return sum(len(council["wards"]) for region in data["regions"] for council in region[units_key])
+
+def time_extractor(extract, pdf_path, page_count, workers):
+    """Run one extractor over every data page; returns (seconds, data)"""
+    start = time.perf_counter()
+    # The parsers print progress for every unit; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = extract(pdf_path, start_page=54, end_page=page_count, workers=workers)
+    return time.perf_counter() - start, data
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extractors on synthetic census PDFs")
+    parser.add_argument('--input', default='population_stats.json', help='Dataset the synthetic PDFs are generated from')
+    parser.add_argument('--scales', default='1,10,100', help='Comma-separated scale factors')
+    parser.add_argument('--workdir', default='bench_pdfs', help='Directory for the generated PDFs (reused between runs)')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='Rewrite the PDFs even if they exist, e.g. after changing the input or synthetic_pdf.py')
+    parser.add_argument('--workers', type=int, default=1, help='Processes used for page text extraction')
+    parser.add_argument('--table-layout', action='store_true', help='Generate the fixed-column table layout')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    expected_wards = count_wards(data, "councils")
+    os.makedirs(args.workdir, exist_ok=True)
+
+    print("="*80)
+    print(f"{'Scale':>6} {'Pages':>7} {'Extractor':<18} {'Seconds':>9} {'Pages/sec':>10} {'Wards':>9} {'Expected':>9}")
+    print("="*80)
+
+    results = []
+    for scale in [int(value) for value in args.scales.split(',')]:
+        layout = 'table' if args.table_layout else 'lines'
+        pdf_path = os.path.join(args.workdir, f"synthetic_{layout}_{scale}x.pdf")
+        if os.path.exists(pdf_path) and not args.regenerate:
+            page_count = count_pages(pdf_path)
+        else:
+            page_count = generate(data, pdf_path, scale, args.table_layout)
+        data_pages = page_count - FRONT_MATTER_PAGES
+
+        for name, extract, units_key in (
+            ('admin_units', extract_administrative_units, "data"),
+            ('population_stats', extract_population_stats, "councils"),
+        ):
+            seconds, extracted = time_extractor(extract, pdf_path, page_count, args.workers)
+            wards = count_wards(extracted, units_key)
+            result = {
+                "scale": scale,
+                "pages": data_pages,
+                "extractor": name,
+                "seconds": round(seconds, 3),
+                "pages_per_sec": round(data_pages / seconds, 2),
+                "wards": wards,
+                "expected_wards": expected_wards * scale,
+            }
+            results.append(result)
+            print(f"{scale:>5}x {data_pages:>7,} {name:<18} {seconds:>9.2f} {result['pages_per_sec']:>10.1f} "
+                  f"{wards:>9,} {expected_wards * scale:>9,}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"workers": args.workers, "table_layout": args.table_layout, "results": results}, f, indent=2)
+        print(f"\n✓ Results saved to: {args.output}")
+
+if __name__ == '__main__':
+    main()
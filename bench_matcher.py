@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for name_matcher.py
+Builds a batch of noisy ward names (case changes, hyphens for spaces, dropped
+and swapped letters) from the dataset, matches them unscoped, scoped to the
+region and scoped to the council, and compares accuracy and rows/sec against
+difflib.get_close_matches over every ward name
+Distinct rows each miss the lookup cache, so their rate is the index's own
+speed; the full batch repeats spellings and mostly measures cache hits
+"""
+
+import argparse
+import difflib
+import random
+import time
+
+from name_matcher import NameMatcher
+from population_query import normalize_name
+
+def add_noise(name, rng):
+    """A realistic misspelling of a ward name"""
+    kind = rng.random()
+    if kind < 0.25:
+        return name.upper()
+    if kind < 0.45:
+        return name.replace(' ', '-').title()
+    letters = list(name)
+    position = rng.randrange(1, len(letters)) if len(letters) > 1 else 0
+    if kind < 0.7:
+        del letters[position]
+    elif kind < 0.85 and position < len(letters) - 1:
+        letters[position], letters[position + 1] = letters[position + 1], letters[position]
+    else:
+        letters.insert(position, rng.choice('aeiou'))
+    return ''.join(letters)
+
+def build_rows(matcher, count, distinct, seed):
+    """count rows drawn from `distinct` noisy spellings, as (name, region, council, expected_entry)"""
+    rng = random.Random(seed)
+    wards = [entry for entry in matcher.entries if entry.level == 'ward']
+    spellings = []
+    for _ in range(distinct):
+        entry = rng.choice(wards)
+        spellings.append((add_noise(entry.name, rng), entry.region, entry.council, entry))
+    return [rng.choice(spellings) for _ in range(count)]
+
+def is_correct(match, expected):
+    """A match is right when it names the expected ward (any unit with the same spelling counts unscoped)"""
+    return match is not None and normalize_name(match.entry.name) == normalize_name(expected.name)
+
+def time_batch(matcher, rows, scope):
+    """Match a batch from a cold cache; returns (seconds, accuracy, cache hit rate)"""
+    matcher.lookup.cache_clear()
+    if scope == 'council':
+        batch = [(name, region, council) for name, region, council, _ in rows]
+    elif scope == 'region':
+        batch = [(name, region) for name, region, _, _ in rows]
+    else:
+        batch = [name for name, _, _, _ in rows]
+    start = time.perf_counter()
+    matches = matcher.match_batch(batch)
+    seconds = time.perf_counter() - start
+    correct = sum(is_correct(match, row[3]) for match, row in zip(matches, rows))
+    cache = matcher.lookup.cache_info()
+    return seconds, correct / len(rows), cache.hits / (cache.hits + cache.misses)
+
+def time_difflib(matcher, rows):
+    """Baseline: difflib.get_close_matches against every ward name, one query per row"""
+    names = sorted({entry.name for entry in matcher.entries if entry.level == 'ward'})
+    start = time.perf_counter()
+    correct = 0
+    for name, _, _, expected in rows:
+        found = difflib.get_close_matches(name, names, n=1, cutoff=0.6)
+        correct += bool(found) and normalize_name(found[0]) == normalize_name(expected.name)
+    return time.perf_counter() - start, correct / len(rows), 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy ward-name matching")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--dataset', help='Also index dataset.json spellings')
+    parser.add_argument('--rows', type=int, default=200000, help='Rows in the batch join')
+    parser.add_argument('--distinct', type=int, default=20000, help='Distinct noisy spellings among the rows')
+    parser.add_argument('--difflib-rows', type=int, default=200, help='Rows matched by the difflib baseline')
+    parser.add_argument('--seed', type=int, default=2022)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matcher = NameMatcher.load(args.input, args.dataset)
+    build_seconds = time.perf_counter() - start
+    rows = build_rows(matcher, args.rows, args.distinct, args.seed)
+    # Spellings that normalize to the same key share a cache entry, so dedupe on the key
+    unique_rows = list({(normalize_name(row[0]),) + row[1:3]: row for row in rows}.values())
+
+    print("="*80)
+    print(f"Index: {len(matcher.entries):,} names in {build_seconds * 1000:.0f} ms")
+    print(f"Batch: {len(rows):,} rows, {len(unique_rows):,} distinct")
+    print("="*80)
+    print(f"{'Method':<28} {'Rows':>9} {'Seconds':>9} {'Rows/sec':>12} {'Accuracy':>9} {'Cache hits':>11}")
+
+    results = []
+    for scope in ('country', 'region', 'council'):
+        results.append((f"index, {scope}, uncached", len(unique_rows)) + time_batch(matcher, unique_rows, scope))
+        results.append((f"index, {scope}, batch", len(rows)) + time_batch(matcher, rows, scope))
+    baseline_rows = unique_rows[:args.difflib_rows]
+    results.append(("difflib, country", len(baseline_rows)) + time_difflib(matcher, baseline_rows))
+
+    for method, count, seconds, accuracy, hit_rate in results:
+        print(f"{method:<28} {count:>9,} {seconds:>9.2f} {count / seconds:>12,.0f} {accuracy:>8.1%} {hit_rate:>10.1%}")
+    print("="*80)
+
+if __name__ == '__main__':
+    main()
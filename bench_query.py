@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark indexed lookups against the naive nested scan over population_stats.json
+Each query asks for the population of a ward in a named council and region
+"""
+
+import argparse
+import random
+import time
+
+from population_query import PopulationIndex
+
+def naive_ward_lookup(data, ward_name, council_name, region_name):
+    """Walk regions -> councils -> wards the way consumers do without an index"""
+    for region in data["regions"]:
+        if region["region"] != region_name:
+            continue
+        for council in region["councils"]:
+            if council["name"] != council_name:
+                continue
+            for ward in council["wards"]:
+                if ward["name"] == ward_name:
+                    return ward["population"]
+    return None
+
+def naive_name_lookup(data, ward_name):
+    """Find every ward with a given name by scanning the whole dataset"""
+    return [
+        ward["population"]
+        for region in data["regions"]
+        for council in region["councils"]
+        for ward in council["wards"]
+        if ward["name"] == ward_name
+    ]
+
+def time_queries(lookup, queries):
+    """Return queries/sec for running lookup over every query"""
+    start = time.perf_counter()
+    for query in queries:
+        lookup(*query)
+    elapsed = time.perf_counter() - start
+    return len(queries) / elapsed if elapsed else float('inf')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark population_query against nested scans")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=2022)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = PopulationIndex.load(args.input)
+    load_time = time.perf_counter() - start
+    data = index.data
+
+    wards = [
+        (ward["name"], council["name"], region["region"])
+        for region in data["regions"]
+        for council in region["councils"]
+        for ward in council["wards"]
+    ]
+    rng = random.Random(args.seed)
+    queries = [rng.choice(wards) for _ in range(args.queries)]
+    name_queries = [(query[0],) for query in queries]
+
+    for query in queries[:1000]:
+        assert index.get_ward(*query).population == naive_ward_lookup(data, *query)
+
+    print(f"Wards: {len(wards):,}, queries: {len(queries):,}, load + index: {load_time * 1000:.1f} ms")
+    print(f"Ward in council/region  naive: {time_queries(lambda *q: naive_ward_lookup(data, *q), queries):>12,.0f} q/s")
+    print(f"Ward in council/region  index: {time_queries(index.get_ward, queries):>12,.0f} q/s")
+    print(f"Ward by name            naive: {time_queries(lambda *q: naive_name_lookup(data, *q), name_queries):>12,.0f} q/s")
+    print(f"Ward by name            index: {time_queries(index.find_wards, name_queries):>12,.0f} q/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Load test for lookup_server.py
+Starts the server in a subprocess (or targets a running one with --url), opens
+keep-alive connections and replays a mix of region, council, ward, search and
+aggregate requests drawn from the dataset, then reports p50/p99 latency and
+requests/sec
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from population_query import PopulationIndex
+
+def build_requests(index, count, seed):
+    """A reproducible mix of request targets covering every endpoint"""
+    rng = random.Random(seed)
+    regions = list(index.regions_by_name)
+    councils = [(region_name, council) for region_name in regions for council in index.regions_by_name[region_name]["councils"]]
+    wards = [record for records in index.wards_by_name.values() for record in records]
+    council_types = sorted(index.councils_by_type)
+
+    targets = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.35:
+            record = rng.choice(wards)
+            query = {"name": record.name, "council": record.council, "region": record.region}
+            targets.append("/ward?" + urlencode(query))
+        elif kind < 0.5:
+            targets.append("/ward?" + urlencode({"name": rng.choice(wards).name.lower()}))
+        elif kind < 0.65:
+            region_name, council = rng.choice(councils)
+            targets.append("/council?" + urlencode({"region": region_name, "name": council["name"], "type": council["type"]}))
+        elif kind < 0.75:
+            targets.append("/region?" + urlencode({"name": rng.choice(regions)}))
+        elif kind < 0.8:
+            targets.append("/search?" + urlencode({"prefix": rng.choice(wards).name[:3], "limit": 10}))
+        else:
+            query = {"region": rng.choice(regions)}
+            if rng.random() < 0.7:
+                query["type"] = rng.choice(council_types)
+            targets.append("/aggregate?" + urlencode(query))
+    return targets
+
+async def run_connection(host, port, targets, latencies, statuses):
+    """Send targets one after another over a single keep-alive connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(status_line.split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_load(host, port, targets, concurrency):
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_connection(host, port, targets[i::concurrency], latencies, statuses)
+        for i in range(concurrency)
+    ])
+    return time.perf_counter() - start, latencies, statuses
+
+async def wait_for_server(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the population lookup server")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--url', help='Test a running server (e.g. http://127.0.0.1:8022) instead of starting one')
+    parser.add_argument('--port', type=int, default=8023, help='Port for the server started by this script')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=32, help='Keep-alive connections')
+    parser.add_argument('--seed', type=int, default=2022)
+    args = parser.parse_args()
+
+    index = PopulationIndex.load(args.input)
+    targets = build_requests(index, args.requests, args.seed)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = '127.0.0.1', args.port
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lookup_server.py'),
+             '--input', args.input, '--host', host, '--port', str(port)],
+            stdout=subprocess.DEVNULL
+        )
+
+    try:
+        asyncio.run(wait_for_server(host, port))
+        elapsed, latencies, statuses = asyncio.run(run_load(host, port, targets, args.concurrency))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    print("="*80)
+    print(f"Requests: {len(latencies):,} over {args.concurrency} connections in {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"Latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms, p99: {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max: {latencies[-1] * 1000:.2f} ms")
+    print(f"Status codes: {', '.join(f'{status}: {count:,}' for status, count in sorted(statuses.items()))}")
+    print("="*80)
+
+if __name__ == '__main__':
+    main()
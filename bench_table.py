@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark the word-coordinate table reader against the text-line regex path
+Both modes extract the data pages straight from the PDF (no page cache) and
+are compared on pages/sec and on ward-row recall against reference datasets
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+from extract_all import extract_all
+from line_classifier import council_type_key
+from pdf_pages import count_pages
+
+def admin_ward_keys(data):
+    """(region, council type, council, ward) for every ward in dataset.json-shaped data"""
+    keys = set()
+    for region in data["regions"]:
+        for council in region["data"]:
+            council_type = council_type_key(council)
+            for ward_name in council["wards"]:
+                keys.add((region["region"], council_type, council[council_type], ward_name))
+    return keys
+
+def stats_ward_keys(data):
+    """(region, council type, council, ward) for every ward in population_stats.json-shaped data"""
+    return {
+        (region["region"], council["type"], council["name"], ward["name"])
+        for region in data["regions"]
+        for council in region["councils"]
+        for ward in council["wards"]
+    }
+
+def recall(found, reference):
+    """Share of reference rows that were extracted"""
+    return len(found & reference) / len(reference) if reference else float('nan')
+
+def run_mode(pdf_path, start_page, end_page, table_mode):
+    """Extract both datasets in one mode; returns (seconds, admin_data, stats_data)"""
+    start = time.perf_counter()
+    # The parsers print progress for every unit; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        admin_data, stats_data = extract_all(pdf_path, start_page, end_page, table_mode=table_mode)
+    return time.perf_counter() - start, admin_data, stats_data
+
+def load_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark table-mode extraction against the text-line regex path")
+    parser.add_argument('--pdf', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf')
+    parser.add_argument('--admin-reference', default='dataset.json', help='Reference administrative units for recall')
+    parser.add_argument('--stats-reference', default='population_stats.json', help='Reference population statistics for recall')
+    parser.add_argument('--start-page', type=int, default=54)
+    parser.add_argument('--end-page', type=int, default=286)
+    args = parser.parse_args()
+
+    pages = min(args.end_page, count_pages(args.pdf)) - args.start_page + 1
+    admin_reference = load_json(args.admin_reference)
+    stats_reference = load_json(args.stats_reference)
+
+    print("="*80)
+    print(f"Pages: {pages}")
+    print("="*80)
+    print(f"{'Mode':<12} {'Pages/sec':>10} {'Admin wards':>12} {'Stats wards':>12} {'Admin recall':>13} {'Stats recall':>13}")
+
+    for label, table_mode in (('text', False), ('table', True)):
+        elapsed, admin_data, stats_data = run_mode(args.pdf, args.start_page, args.end_page, table_mode)
+        admin_keys = admin_ward_keys(admin_data)
+        stats_keys = stats_ward_keys(stats_data)
+        admin_recall = recall(admin_keys, admin_ward_keys(admin_reference)) if admin_reference else float('nan')
+        stats_recall = recall(stats_keys, stats_ward_keys(stats_reference)) if stats_reference else float('nan')
+        print(f"{label:<12} {pages / elapsed:>10.1f} {len(admin_keys):>12,} {len(stats_keys):>12,} "
+              f"{admin_recall:>13.2%} {stats_recall:>13.2%}")
+
+if __name__ == '__main__':
+    main()
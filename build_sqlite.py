@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Build an indexed SQLite distribution of the dataset
+Merges dataset.json (administrative units) and population_stats.json into
+regions/councils/wards tables with foreign keys and name indexes
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+from line_classifier import STAT_FIELDS, council_type_key
+
+STAT_COLUMNS = """
+    both_sexes INTEGER,
+    male INTEGER,
+    female INTEGER,
+    sex_ratio INTEGER,
+    households INTEGER,
+    average_household_size REAL"""
+
+SCHEMA = f"""
+PRAGMA foreign_keys = ON;
+CREATE TABLE regions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,{STAT_COLUMNS}
+);
+CREATE TABLE councils (
+    id INTEGER PRIMARY KEY,
+    region_id INTEGER NOT NULL REFERENCES regions(id),
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,{STAT_COLUMNS},
+    UNIQUE (region_id, type, name)
+);
+CREATE TABLE wards (
+    id INTEGER PRIMARY KEY,
+    council_id INTEGER NOT NULL REFERENCES councils(id),
+    name TEXT NOT NULL,{STAT_COLUMNS}
+);
+CREATE INDEX councils_name ON councils(name);
+CREATE INDEX wards_council ON wards(council_id);
+CREATE INDEX wards_name ON wards(name COLLATE NOCASE);
+"""
+
+def stat_values(population):
+    """Statistics as a tuple in column order, NULL where missing"""
+    population = population or {}
+    return tuple(population.get(field) for field in STAT_FIELDS)
+
+def merge_datasets(admin_data, stats_data):
+    """
+    Merge both extractor outputs into [(region_name, population, [(type, name, population, [(ward, population)])])]
+    Order follows population_stats.json, with units only found in dataset.json appended
+    """
+    regions = {}
+
+    for region in stats_data["regions"] if stats_data else []:
+        councils = regions.setdefault(region["region"], [region.get("population"), {}])[1]
+        for council in region["councils"]:
+            wards = councils.setdefault((council["type"], council["name"]), [council.get("population"), {}])[1]
+            for ward in council["wards"]:
+                wards.setdefault(ward["name"], ward["population"])
+
+    for region in admin_data["regions"] if admin_data else []:
+        councils = regions.setdefault(region["region"], [None, {}])[1]
+        for council in region["data"]:
+            council_type = council_type_key(council)
+            wards = councils.setdefault((council_type, council[council_type]), [None, {}])[1]
+            for ward_name in council["wards"]:
+                wards.setdefault(ward_name, None)
+
+    return [
+        (region_name, region_population, [
+            (council_type, council_name, council_population, list(wards.items()))
+            for (council_type, council_name), (council_population, wards) in councils.items()
+        ])
+        for region_name, (region_population, councils) in regions.items()
+    ]
+
+def build_sqlite(admin_data, stats_data, output_path):
+    """Write the merged dataset to a new SQLite file, replacing any existing one"""
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    conn = sqlite3.connect(output_path)
+    conn.executescript(SCHEMA)
+    counts = {"regions": 0, "councils": 0, "wards": 0}
+
+    with conn:
+        for region_name, region_population, councils in merge_datasets(admin_data, stats_data):
+            region_id = conn.execute(
+                "INSERT INTO regions (name, both_sexes, male, female, sex_ratio, households, average_household_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (region_name,) + stat_values(region_population)
+            ).lastrowid
+            counts["regions"] += 1
+
+            for council_type, council_name, council_population, wards in councils:
+                council_id = conn.execute(
+                    "INSERT INTO councils (region_id, type, name, both_sexes, male, female, sex_ratio, households, average_household_size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (region_id, council_type, council_name) + stat_values(council_population)
+                ).lastrowid
+                counts["councils"] += 1
+
+                conn.executemany(
+                    "INSERT INTO wards (council_id, name, both_sexes, male, female, sex_ratio, households, average_household_size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(council_id, ward_name) + stat_values(population) for ward_name, population in wards]
+                )
+                counts["wards"] += len(wards)
+
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+def load_json(path):
+    """Load a JSON file, or return None if it does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an indexed SQLite file from the extracted datasets")
+    parser.add_argument('--admin-input', default='dataset.json')
+    parser.add_argument('--stats-input', default='population_stats.json')
+    parser.add_argument('--output', default='census.sqlite')
+    args = parser.parse_args()
+
+    admin_data = load_json(args.admin_input)
+    stats_data = load_json(args.stats_input)
+    if admin_data is None and stats_data is None:
+        parser.error('no input found; run the extraction scripts first')
+
+    counts = build_sqlite(admin_data, stats_data, args.output)
+
+    print(f"Regions: {counts['regions']}, councils: {counts['councils']}, wards: {counts['wards']}")
+    print(f"\n✓ Database saved to: {args.output}")
+
+if __name__ == '__main__':
+    main()
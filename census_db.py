@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Lazy accessor for the SQLite distribution built by build_sqlite.py
+Opening the database reads nothing; each region is fetched with indexed
+queries the first time it is asked for and then kept in memory
+"""
+
+import sqlite3
+
+from line_classifier import STAT_FIELDS
+
+STAT_SELECT = ', '.join(STAT_FIELDS)
+
+def population_from_row(row, offset):
+    """Population dict from the six statistics columns starting at row[offset]; {} if none were recorded"""
+    values = row[offset:offset + len(STAT_FIELDS)]
+    if all(value is None for value in values):
+        return {}
+    return dict(zip(STAT_FIELDS, values))
+
+class CensusDB:
+    """
+    Read-only view of census.sqlite
+    region() returns dicts shaped like population_stats.json regions
+    """
+
+    def __init__(self, path='census.sqlite'):
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        self.regions_loaded = {}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def region_names(self):
+        return [name for (name,) in self.conn.execute("SELECT name FROM regions ORDER BY id")]
+
+    def region(self, region_name):
+        """Load one region with its councils and wards, or return None"""
+        if region_name in self.regions_loaded:
+            return self.regions_loaded[region_name]
+
+        row = self.conn.execute(f"SELECT id, name, {STAT_SELECT} FROM regions WHERE name = ?", (region_name,)).fetchone()
+        if row is None:
+            return None
+
+        region = {"region": row[1], "population": population_from_row(row, 2), "councils": []}
+        councils_by_id = {}
+        for council_row in self.conn.execute(
+            f"SELECT id, type, name, {STAT_SELECT} FROM councils WHERE region_id = ? ORDER BY id", (row[0],)
+        ):
+            council = {
+                "type": council_row[1],
+                "name": council_row[2],
+                "population": population_from_row(council_row, 3),
+                "wards": []
+            }
+            councils_by_id[council_row[0]] = council
+            region["councils"].append(council)
+
+        for ward_row in self.conn.execute(
+            f"SELECT wards.council_id, wards.name, {', '.join('wards.' + field for field in STAT_FIELDS)} "
+            "FROM wards JOIN councils ON councils.id = wards.council_id "
+            "WHERE councils.region_id = ? ORDER BY wards.id", (row[0],)
+        ):
+            councils_by_id[ward_row[0]]["wards"].append({"name": ward_row[1], "population": population_from_row(ward_row, 2)})
+
+        self.regions_loaded[region_name] = region
+        return region
+
+    def council(self, region_name, council_name, council_type=None):
+        """Return a council dict from its region, loading the region if needed"""
+        region = self.region(region_name)
+        if region is None:
+            return None
+        for council in region["councils"]:
+            if council["name"] == council_name and (council_type is None or council["type"] == council_type):
+                return council
+        return None
+
+    def find_wards(self, ward_name):
+        """
+        Case-insensitive ward lookup across the whole country with a single indexed query
+        Returns dicts with region, council_type, council, name and population
+        """
+        query = (
+            f"SELECT regions.name, councils.type, councils.name, wards.name, "
+            f"{', '.join('wards.' + field for field in STAT_FIELDS)} "
+            "FROM wards JOIN councils ON councils.id = wards.council_id "
+            "JOIN regions ON regions.id = councils.region_id "
+            "WHERE wards.name = ? COLLATE NOCASE ORDER BY wards.id"
+        )
+        return [
+            {
+                "region": row[0],
+                "council_type": row[1],
+                "council": row[2],
+                "name": row[3],
+                "population": population_from_row(row, 4)
+            }
+            for row in self.conn.execute(query, (ward_name,))
+        ]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Columnar export of population statistics
+Writes one fixed-width .npy file per column plus a string table, so the
+statistics can be memory-mapped and aggregated with vectorized NumPy calls
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from line_classifier import STAT_FIELDS
+
+FLOAT_FIELDS = ('average_household_size',)
+LEVELS = ('region', 'council', 'ward')
+
+# Missing values: -1 in integer columns, NaN in float columns
+MISSING_INT = -1
+
+def stat_value(population, field):
+    """Read one statistic, substituting the column's missing-value marker for None"""
+    value = population.get(field)
+    if value is None:
+        return np.nan if field in FLOAT_FIELDS else MISSING_INT
+    return value
+
+def build_columns(data, source_pages=None):
+    """
+    Flatten population_stats data into column arrays
+    Returns (columns, strings): columns maps '<level>_<field>' to a NumPy array and
+    strings is the table that the *_name and council_type columns index into
+    With a parser's source_pages, '<level>_page' columns hold the page each unit was found on
+    """
+    strings = []
+    string_ids = {}
+
+    def string_id(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    rows = {level: {field: [] for field in STAT_FIELDS} for level in LEVELS}
+    for level in LEVELS:
+        rows[level]['name'] = []
+    rows['council']['region_code'] = []
+    rows['council']['type'] = []
+    rows['ward']['region_code'] = []
+    rows['ward']['council_code'] = []
+    if source_pages is not None:
+        for level in LEVELS:
+            rows[level]['page'] = []
+
+    for region_code, region in enumerate(data["regions"]):
+        rows['region']['name'].append(string_id(region["region"]))
+        for field in STAT_FIELDS:
+            rows['region'][field].append(stat_value(region.get("population", {}), field))
+        if source_pages is not None:
+            rows['region']['page'].append(source_pages.get(("region", region["region"]), MISSING_INT))
+
+        for council in region["councils"]:
+            council_code = len(rows['council']['name'])
+            rows['council']['name'].append(string_id(council["name"]))
+            rows['council']['region_code'].append(region_code)
+            rows['council']['type'].append(string_id(council["type"]))
+            for field in STAT_FIELDS:
+                rows['council'][field].append(stat_value(council.get("population", {}), field))
+            council_key = (region["region"], council["type"], council["name"])
+            if source_pages is not None:
+                rows['council']['page'].append(source_pages.get(("council",) + council_key, MISSING_INT))
+
+            for ward in council["wards"]:
+                rows['ward']['name'].append(string_id(ward["name"]))
+                rows['ward']['region_code'].append(region_code)
+                rows['ward']['council_code'].append(council_code)
+                for field in STAT_FIELDS:
+                    rows['ward'][field].append(stat_value(ward["population"], field))
+                if source_pages is not None:
+                    rows['ward']['page'].append(source_pages.get(("ward",) + council_key + (ward["name"],), MISSING_INT))
+
+    columns = {}
+    for level in LEVELS:
+        for field, values in rows[level].items():
+            dtype = np.float64 if field in FLOAT_FIELDS else (np.int64 if field in STAT_FIELDS else np.int32)
+            columns[f"{level}_{field}"] = np.array(values, dtype=dtype)
+    return columns, strings
+
+def write_columns(columns, strings, output_dir):
+    """Write each column as <output_dir>/<name>.npy and the string table as strings.json"""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, array in columns.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), array)
+    with open(os.path.join(output_dir, 'strings.json'), 'w', encoding='utf-8') as f:
+        json.dump(strings, f, ensure_ascii=False)
+
+def load_columns(input_dir):
+    """
+    Memory-map every column in a directory written by write_columns
+    Returns (columns, strings)
+    """
+    columns = {}
+    for filename in sorted(os.listdir(input_dir)):
+        if filename.endswith('.npy'):
+            columns[filename[:-4]] = np.load(os.path.join(input_dir, filename), mmap_mode='r')
+    with open(os.path.join(input_dir, 'strings.json'), 'r', encoding='utf-8') as f:
+        strings = json.load(f)
+    return columns, strings
+
+def export_columns(data, output_dir, source_pages=None):
+    """Build and write the columnar export for population_stats data"""
+    columns, strings = build_columns(data, source_pages)
+    write_columns(columns, strings, output_dir)
+    return columns, strings
+
+def ward_totals_by_region(columns, field='both_sexes'):
+    """Sum a ward column per region, indexed by region code"""
+    values = columns[f"ward_{field}"]
+    return np.bincount(columns['ward_region_code'], weights=np.where(values >= 0, values, 0),
+                       minlength=len(columns['region_name']))
+
+def sex_ratio_distribution(columns, bins=20):
+    """Histogram (counts, bin_edges) of ward sex ratios"""
+    ratios = columns['ward_sex_ratio']
+    return np.histogram(ratios[ratios >= 0], bins=bins)
+
+def household_size_percentiles(columns, percentiles=(5, 25, 50, 75, 95)):
+    """Percentiles of ward average household size"""
+    return np.nanpercentile(columns['ward_average_household_size'], percentiles)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export population statistics as memory-mappable columns")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--output', default='population_stats_columns')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    columns, strings = export_columns(data, args.output)
+
+    print(f"Regions: {len(columns['region_name'])}, councils: {len(columns['council_name'])}, wards: {len(columns['ward_name'])}")
+    print(f"Strings: {len(strings)}")
+    print(f"\n✓ Columns saved to: {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -4,169 +4,115 @@ Extract administrative units from Tanzania Population Distribution Report 2022
 The data starts around page 170 and continues through page 285
 """
 
-import pdfplumber
-import re
+import argparse
 import json
+import sys
 
-def clean_text(text):
-    """Clean and normalize text"""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+from line_classifier import (
+    ADMIN_CLASSIFIER, REGION_HEADER, COUNCIL_HEADER, WARD_ROW, clean_text, council_type_key, split_council_name
+)
+from json_stream import StreamingJSONWriter, NDJSONWriter
+from page_index import MissingRegionError, resolve_region_option
+from profiler import NULL_PROFILER, Profiler, print_profile
+from region_parser import RegionParser, add_extraction_arguments, cache_path_option, extract_regions
 
-def extract_administrative_units(pdf_path, start_page=54, end_page=286):
+# Top-level fields written before the regions list
+DATA_HEADER = {
+    "country": "Tanzania"
+}
+
+class AdminUnitsParser(RegionParser):
     """
-    Extract regions, councils, and wards from the PDF
+    Builds the regions/councils/wards hierarchy of administrative units
+    Records are ["region", name], ["council", type, name] and ["ward", name]
     """
-    data = {
-        "country": "Tanzania",
-        "regions": []
-    }
-    
-    current_region = None
-    current_council = None
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num in range(start_page - 1, min(end_page, len(pdf.pages))):
-            page = pdf.pages[page_num]
-            text = page.extract_text()
+
+    DATA_HEADER = DATA_HEADER
+    COUNCILS = "data"
+
+    def feed_page(self, text, page_number=None):
+        """Parse the extracted text of one page"""
+        self.page_number = page_number
+        if not text:
+            return
+        
+        lines = text.split('\n')
+        
+        for i, raw_line in enumerate(lines):
+            line = raw_line.strip()
             
-            if not text:
+            if not line:
                 continue
             
-            lines = text.split('\n')
+            # The line and next line together may form a region header
+            # Pattern: "Table X.0: ..." on one line, "... Region; 2022 PHC" on next
+            next_line = lines[i + 1].strip() if i + 1 < len(lines) else None
+            
+            kind, match = ADMIN_CLASSIFIER.classify(line, next_line)
             
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+            if kind == REGION_HEADER:
+                region_name = clean_text(match.group(1))
                 
-                if not line:
-                    i += 1
+                # Skip if it's just text before the actual region name
+                if 'Household' in region_name or 'Number' in region_name or 'Average' in region_name:
                     continue
                 
-                # Check if this line and next line together form a region header
-                # Pattern: "Table X.0: ..." on one line, "... Region; 2022 PHC" on next
-                combined = line
-                if i + 1 < len(lines):
-                    combined = line + " " + lines[i + 1].strip()
-                
-                # Detect Region header
-                # Try specific pattern first: "by Council, RegionName Region"
-                region_match = re.search(r'by\s+Council[,\s]+([A-Z][a-zA-Z\s]+?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
-                
-                if not region_match:
-                    # Fallback to less specific pattern
-                    region_match = re.search(r'Table\s+\d+\.\s*0[:\s]+.*?([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
-                
-                if region_match:
-                    region_name = clean_text(region_match.group(1))
-                    
-                    # Skip if it's just text before the actual region name
-                    if 'Household' in region_name or 'Number' in region_name or 'Average' in region_name:
-                        i += 1
-                        continue
-                    
-                    # Check if region already exists
-                    existing_region = None
-                    for reg in data["regions"]:
-                        if reg["region"] == region_name:
-                            existing_region = reg
-                            break
-                    
-                    if not existing_region:
-                        current_region = {
-                            "region": region_name,
-                            "data": []
-                        }
-                        data["regions"].append(current_region)
-                        print(f"Found region: {region_name}")
-                    else:
-                        current_region = existing_region
-                    
-                    current_council = None
-                    i += 1
+                self.emit(["region", region_name])
+            
+            elif kind == COUNCIL_HEADER and self.current_region:
+                council_type, council_name = split_council_name(clean_text(match.group(1)))
+                if not council_type:
                     continue
                 
-                # Detect Council section headers (e.g., "14.1 NZEGA TOWN COUNCIL")
-                council_section = re.match(r'^\d+\.\s*\d+\s+([A-Z][A-Z\s\'\-]+(?:DISTRICT|MUNICIPAL|TOWN|CITY)\s+COUNCIL)', line)
+                self.emit(["council", council_type, council_name])
+            
+            elif kind == WARD_ROW and self.current_council:
+                ward_name = clean_text(match.group(2))
                 
-                if council_section and current_region:
-                    council_full = clean_text(council_section.group(1))
-                    
-                    # Determine council type and name
-                    if 'DISTRICT COUNCIL' in council_full:
-                        council_type = 'district_council'
-                        council_name = council_full.replace('DISTRICT COUNCIL', '').strip().title()
-                    elif 'MUNICIPAL COUNCIL' in council_full or 'MUNICIPAL' in council_full:
-                        council_type = 'municipal_council'
-                        council_name = council_full.replace('MUNICIPAL COUNCIL', '').replace('MUNICIPAL', '').strip().title()
-                    elif 'TOWN COUNCIL' in council_full:
-                        council_type = 'town_council'
-                        council_name = council_full.replace('TOWN COUNCIL', '').strip().title()
-                    elif 'CITY COUNCIL' in council_full:
-                        council_type = 'city_council'
-                        council_name = council_full.replace('CITY COUNCIL', '').strip().title()
-                    else:
-                        i += 1
-                        continue
-                    
-                    # Check if council already exists
-                    existing_council = None
-                    for council_item in current_region["data"]:
-                        if council_type in council_item and council_item[council_type] == council_name:
-                            existing_council = council_item
-                            break
-                    
-                    if not existing_council:
-                        current_council = {
-                            council_type: council_name,
-                            "wards": []
-                        }
-                        current_region["data"].append(current_council)
-                        print(f"  Found {council_type}: {council_name}")
-                    else:
-                        current_council = existing_council
-                    
-                    i += 1
+                # Skip if it looks like a council or district
+                skip_terms = ['Council', 'Municipal', 'District', 'Region', 'Town', 'City']
+                if any(term in ward_name for term in skip_terms):
                     continue
                 
-                # Detect ward entries (numbered list at start of line)
-                ward_match = re.match(r'^(\d+)\.\s+([A-Z][a-zA-Z\s\'\-]+?)(?:\s+\d|$)', line)
-                
-                if ward_match and current_council:
-                    ward_name = clean_text(ward_match.group(2))
-                    
-                    # Skip if it looks like a council or district
-                    skip_terms = ['Council', 'Municipal', 'District', 'Region', 'Town', 'City']
-                    if any(term in ward_name for term in skip_terms):
-                        i += 1
-                        continue
-                    
-                    # Skip very short names
-                    if len(ward_name) < 3:
-                        i += 1
-                        continue
-                    
-                    if ward_name not in current_council["wards"]:
-                        current_council["wards"].append(ward_name)
+                # Skip very short names
+                if len(ward_name) < 3:
+                    continue
                 
-                i += 1
-    
-    return data
+                # Duplicates are dropped in apply(), so a page's records don't depend on earlier pages
+                self.emit(["ward", ward_name])
 
-def main():
-    pdf_path = '/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf'
-    output_path = '/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/dataset.json'
-    
-    print("="*80)
-    print("Extracting administrative units from Tanzania Population Distribution Report")
-    print(f"Processing pages 54-286 (actual data pages)")
-    print("="*80)
-    
-    data = extract_administrative_units(pdf_path, start_page=54, end_page=286)
-    
-    print("\n" + "="*80)
-    print("Extraction complete!")
-    print("="*80)
+    def new_region(self, region_name):
+        return {
+            "region": region_name,
+            "data": []
+        }
+
+    def new_council(self, council_type, council_name):
+        return {
+            council_type: council_name,
+            "wards": []
+        }
+
+    def council_id(self, council):
+        council_type = council_type_key(council)
+        return council_type, council[council_type]
+
+    def new_ward(self, record):
+        return record[1]
+
+def extract_administrative_units(pdf_path, start_page=54, end_page=286, workers=1, cache_path=None, on_region_complete=None,
+                                 regions=None, table_mode=False, profiler=NULL_PROFILER,
+                                 page_numbers=None):
+    """
+    Extract regions, councils, and wards from the PDF
+    With regions, page_numbers are their pages if already resolved (see page_index.resolve_region_option)
+    """
+    return extract_regions(AdminUnitsParser, pdf_path, start_page, end_page, workers=workers, cache_path=cache_path,
+                           on_region_complete=on_region_complete, regions=regions, table_mode=table_mode,
+                           profiler=profiler, page_numbers=page_numbers)
+
+def print_summary(data):
+    """Print region, council and ward counts for extracted data"""
     print(f"Regions found: {len(data['regions'])}")
     
     total_councils = 0
@@ -181,12 +127,70 @@ def main():
     
     print(f"\nTotal councils: {total_councils}")
     print(f"Total wards: {total_wards}")
-    
-    # Save to JSON
+
+def save_json(data, output_path):
+    """Write extracted data as pretty-printed UTF-8 JSON"""
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract administrative units from the Tanzania Population Distribution Report")
+    add_extraction_arguments(parser)
+    parser.add_argument('--output', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/dataset.json')
+    args = parser.parse_args()
+    pdf_path = args.pdf
+    cache_path = cache_path_option(args)
+    output_path = args.output
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    with profiler.stage('region_index'):
+        args.region, region_pages = resolve_region_option(parser, pdf_path, args.region)
+    
+    print("="*80)
+    print("Extracting administrative units from Tanzania Population Distribution Report")
+    print(f"Processing pages 54-286 (actual data pages)")
+    if args.workers > 1:
+        print(f"Using {args.workers} worker processes")
+    print("="*80)
+    
+    writer = None
+    if args.ndjson:
+        writer = NDJSONWriter(output_path)
+    elif args.stream:
+        writer = StreamingJSONWriter(output_path, DATA_HEADER)
+    
+    try:
+        data = extract_administrative_units(pdf_path, start_page=54, end_page=286, workers=args.workers, cache_path=cache_path,
+                                            on_region_complete=profiler.wrap('json', writer.write_region if writer else None),
+                                            regions=args.region, page_numbers=region_pages, table_mode=args.table_mode,
+                                            profiler=profiler)
+    except BaseException as error:
+        # Keep the previous output rather than a truncated one
+        if writer:
+            writer.discard()
+        if isinstance(error, MissingRegionError):
+            sys.exit(f"Error: {error}")
+        raise
+    
+    print("\n" + "="*80)
+    print("Extraction complete!")
+    print("="*80)
+    if writer:
+        with profiler.stage('json'):
+            writer.close()
+        print(f"Regions written: {writer.regions_written}")
+    else:
+        print_summary(data)
+        with profiler.stage('json'):
+            save_json(data, output_path)
     
     print(f"\n✓ Data saved to: {output_path}")
+    
+    if args.profile:
+        report = profiler.save(args.profile, script="extract_admin_units", pdf=pdf_path, workers=args.workers,
+                               table_mode=args.table_mode, region_filter=args.region)
+        print("\nProfile:")
+        print_profile(report)
+        print(f"✓ Profile saved to: {args.profile}")
     print("="*80)
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Extract administrative units and population statistics in a single pass
+Each page of the report is read once and its text is fed to both parsers,
+producing dataset.json and population_stats.json together
+"""
+
+import argparse
+import sys
+
+import extract_admin_units
+import extract_population_stats
+from incremental import extract_incremental, default_manifest_path
+from json_stream import StreamingJSONWriter, NDJSONWriter
+from page_index import MissingRegionError, resolve_region_option, select_region_pages, only_regions, filter_regions
+from pdf_pages import iter_page_texts
+from region_parser import add_extraction_arguments, cache_path_option, check_extraction_arguments
+
+def extract_all(pdf_path, start_page=54, end_page=286, workers=1, cache_path=None,
+                admin_on_region_complete=None, stats_on_region_complete=None, regions=None, table_mode=False,
+                stats_source_pages=None, page_numbers=None):
+    """
+    Extract both datasets from the PDF, reading every page only once
+    Returns (admin_units_data, population_stats_data)
+    A stats_source_pages dict is filled with the page each statistics unit was found on
+    With regions, page_numbers are their pages if already resolved (see page_index.resolve_region_option)
+    """
+    if regions:
+        if page_numbers is None:
+            # Only read the pages of the requested regions
+            regions, page_numbers = select_region_pages(pdf_path, regions, start_page, end_page)
+        admin_on_region_complete = only_regions(regions, admin_on_region_complete)
+        stats_on_region_complete = only_regions(regions, stats_on_region_complete)
+
+    admin_parser = extract_admin_units.AdminUnitsParser(admin_on_region_complete)
+    stats_parser = extract_population_stats.PopulationStatsParser(stats_on_region_complete, stats_source_pages)
+
+    for page_number, text in iter_page_texts(pdf_path, start_page, end_page, workers=workers, cache_path=cache_path,
+                                             page_numbers=page_numbers, table_mode=table_mode):
+        admin_parser.feed_page(text, page_number)
+        stats_parser.feed_page(text, page_number)
+
+    admin_parser.finish()
+    stats_parser.finish()
+    if regions:
+        filter_regions(admin_parser, regions)
+        filter_regions(stats_parser, regions)
+    return admin_parser.data, stats_parser.data
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract administrative units and population statistics in one pass")
+    add_extraction_arguments(parser, profile=False, columns=True)
+    parser.add_argument('--admin-output', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/dataset.json')
+    parser.add_argument('--stats-output', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/population_stats.json')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-parse pages whose text or parser changed; with --region, splice those regions into the full output')
+    parser.add_argument('--manifest', help='Per-page manifest for --incremental (default: extract_manifest.json next to the outputs)')
+    args = parser.parse_args()
+    check_extraction_arguments(parser, args)
+    pdf_path = args.pdf
+    args.region, region_pages = resolve_region_option(parser, pdf_path, args.region)
+    cache_path = cache_path_option(args)
+    admin_output_path = args.admin_output
+    stats_output_path = args.stats_output
+
+    print("="*80)
+    print("Extracting administrative units and population statistics from Tanzania Population Distribution Report")
+    print("Processing pages 54-286 (single pass)")
+    if args.workers > 1:
+        print(f"Using {args.workers} worker processes")
+    print("="*80)
+
+    admin_writer = stats_writer = None
+    if args.ndjson:
+        admin_writer = NDJSONWriter(admin_output_path)
+        stats_writer = NDJSONWriter(stats_output_path)
+    elif args.stream:
+        admin_writer = StreamingJSONWriter(admin_output_path, extract_admin_units.DATA_HEADER)
+        stats_writer = StreamingJSONWriter(stats_output_path, extract_population_stats.DATA_HEADER)
+
+    admin_callback = admin_writer.write_region if admin_writer else None
+    stats_callback = stats_writer.write_region if stats_writer else None
+
+    stats_source_pages = {}
+    try:
+        if args.incremental:
+            manifest_path = args.manifest or default_manifest_path(stats_output_path)
+            admin_data, stats_data, report = extract_incremental(pdf_path, manifest_path, start_page=54, end_page=286,
+                                                                 workers=args.workers, cache_path=cache_path,
+                                                                 regions=args.region, page_numbers=region_pages,
+                                                                 table_mode=args.table_mode,
+                                                                 admin_on_region_complete=admin_callback,
+                                                                 stats_on_region_complete=stats_callback,
+                                                                 stats_source_pages=stats_source_pages)
+            print(f"Pages parsed: {report['parsed']}, replayed from manifest: {report['replayed']}")
+        else:
+            admin_data, stats_data = extract_all(pdf_path, start_page=54, end_page=286, workers=args.workers, cache_path=cache_path,
+                                                 admin_on_region_complete=admin_callback,
+                                                 stats_on_region_complete=stats_callback,
+                                                 regions=args.region, page_numbers=region_pages,
+                                                 table_mode=args.table_mode, stats_source_pages=stats_source_pages)
+    except BaseException as error:
+        # Keep the previous outputs rather than truncated ones
+        if admin_writer:
+            admin_writer.discard()
+            stats_writer.discard()
+        if isinstance(error, MissingRegionError):
+            sys.exit(f"Error: {error}")
+        raise
+
+    print("\n" + "="*80)
+    print("Extraction complete!")
+    print("="*80)
+    if admin_writer:
+        admin_writer.close()
+        stats_writer.close()
+        print(f"Regions written: {admin_writer.regions_written} administrative, {stats_writer.regions_written} population")
+    else:
+        print("\nAdministrative units:")
+        extract_admin_units.print_summary(admin_data)
+        print("\nPopulation statistics:")
+        extract_population_stats.print_summary(stats_data)
+
+        extract_admin_units.save_json(admin_data, admin_output_path)
+        extract_population_stats.save_json(stats_data, stats_output_path)
+
+    print(f"\n✓ Data saved to: {admin_output_path}")
+    print(f"✓ Data saved to: {stats_output_path}")
+
+    mismatches = []
+    if args.columns or args.validate:
+        # NumPy is only needed for the columnar export and validation
+        from validate_stats import run_columns_and_validation
+        mismatches = run_columns_and_validation(stats_data, stats_source_pages, args.columns, args.validate)
+    print("="*80)
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,26 @@ Extract population statistics from Tanzania Population Distribution Report 2022
 Extracts data from pages 23-255, including regional, council, and ward-level statistics
 """
 
-import pdfplumber
-import re
+import argparse
 import json
+import sys
 
-def clean_text(text):
-    """Clean and normalize text"""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+from line_classifier import (
+    STATS_CLASSIFIER, REGION_HEADER, REGION_STATS, COUNCIL_HEADER, COUNCIL_STATS, WARD_ROW,
+    STAT_FIELDS, clean_text, is_stats_region_name, split_council_name
+)
+from json_stream import StreamingJSONWriter, NDJSONWriter
+from page_index import MissingRegionError, resolve_region_option
+from profiler import NULL_PROFILER, Profiler, print_profile
+from region_parser import (
+    RegionParser, add_extraction_arguments, cache_path_option, check_extraction_arguments, extract_regions
+)
+
+# Top-level fields written before the regions list
+DATA_HEADER = {
+    "country": "Tanzania",
+    "source": "2022 Population and Housing Census (PHC)"
+}
 
 def parse_number(text):
     """Parse a number from text, handling commas"""
@@ -26,212 +38,137 @@ def parse_number(text):
         except ValueError:
             return None
 
-def extract_population_stats(pdf_path, start_page=54, end_page=286):
+def parse_stats(match, first_group=1):
+    """Build the population dict from the six statistics columns of a row match"""
+    return {field: parse_number(match.group(first_group + i)) for i, field in enumerate(STAT_FIELDS)}
+
+class PopulationStatsParser(RegionParser):
     """
-    Extract population statistics from the PDF
-    Returns structured data with regions, councils, and wards
+    Builds region, council and ward statistics
+    Records are ["region", name], ["region_stats", population],
+    ["council", type, name], ["council_stats", population] and ["ward", name, population]
     """
-    data = {
-        "country": "Tanzania",
-        "source": "2022 Population and Housing Census (PHC)",
-        "regions": []
-    }
-    
-    current_region = None
-    current_council = None
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num in range(start_page - 1, min(end_page, len(pdf.pages))):
-            page = pdf.pages[page_num]
-            text = page.extract_text()
+
+    DATA_HEADER = DATA_HEADER
+
+    def feed_page(self, text, page_number=None):
+        """Parse the extracted text of one page"""
+        self.page_number = page_number
+        if not text:
+            return
+        
+        lines = text.split('\n')
+        
+        for i, raw_line in enumerate(lines):
+            line = raw_line.strip()
             
-            if not text:
+            if not line:
                 continue
             
-            lines = text.split('\n')
+            next_line = lines[i + 1].strip() if i + 1 < len(lines) else None
+            
+            # Stats rows are looked for under the current region/council names; apply()
+            # keeps the first one, so a page's records don't depend on earlier pages' stats
+            current_region = self.current_region
+            current_council = self.current_council
+            region_name = current_region['region'] if current_region else None
+            council_name = current_council['name'] if current_council else None
             
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+            kind, match = STATS_CLASSIFIER.classify(line, next_line, region_name, council_name)
+            
+            if kind == REGION_HEADER:
+                region_name = clean_text(match.group(1))
                 
-                if not line:
-                    i += 1
+                # Skip if it's not a valid region name
+                if not is_stats_region_name(region_name):
                     continue
                 
-                # Check if this line and next line together form a region header
-                combined = line
-                if i + 1 < len(lines):
-                    combined = line + " " + lines[i + 1].strip()
-                
-                # Detect Region summary table header (e.g., "Table 1. 0: Population Distribution...")
-                # More specific pattern: "by Council, RegionName Region; 2022 PHC"
-                region_match = re.search(r'by\s+Council[,\s]+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
-                
-                if not region_match:
-                    # Fallback pattern for when region name comes right before "Region"
-                    region_match = re.search(r'Council\s+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', combined, re.IGNORECASE)
-                
-                if region_match:
-                    region_name = clean_text(region_match.group(1))
-                    
-                    # Skip if it's not a valid region name
-                    if 'Household' in region_name or 'Number' in region_name or 'Average' in region_name or 'Size' in region_name or 'by' in region_name.lower():
-                        i += 1
-                        continue
-                    
-                    # Check if region already exists
-                    existing_region = None
-                    for reg in data["regions"]:
-                        if reg["region"] == region_name:
-                            existing_region = reg
-                            break
-                    
-                    if not existing_region:
-                        current_region = {
-                            "region": region_name,
-                            "population": {},
-                            "councils": []
-                        }
-                        data["regions"].append(current_region)
-                        print(f"Found region: {region_name}")
-                    else:
-                        current_region = existing_region
-                    
-                    current_council = None
-                    i += 1
+                self.emit(["region", region_name])
+            
+            elif kind == REGION_STATS:
+                self.emit(["region_stats", parse_stats(match)])
+            
+            elif kind == COUNCIL_HEADER and current_region:
+                council_type, council_name = split_council_name(clean_text(match.group(1)))
+                if not council_type:
                     continue
                 
-                # Extract regional-level statistics (appears after region header)
-                if current_region and not current_region.get("population"):
-                    # Look for lines with region name followed by numbers
-                    region_stats = re.match(r'^' + re.escape(current_region['region']) + r'\s+Region\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line)
-                    if region_stats:
-                        current_region["population"] = {
-                            "both_sexes": parse_number(region_stats.group(1)),
-                            "male": parse_number(region_stats.group(2)),
-                            "female": parse_number(region_stats.group(3)),
-                            "sex_ratio": parse_number(region_stats.group(4)),
-                            "households": parse_number(region_stats.group(5)),
-                            "average_household_size": parse_number(region_stats.group(6))
-                        }
-                        print(f"  Region stats: {current_region['population']['both_sexes']:,} people")
-                        i += 1
-                        continue
-                
-                # Detect Council section headers (e.g., "14.1 NZEGA TOWN COUNCIL")
-                council_section = re.match(r'^\d+\.\s*\d+\s+([A-Z][A-Z\s\'\-]+(?:DISTRICT|MUNICIPAL|TOWN|CITY)\s+COUNCIL)', line)
+                self.emit(["council", council_type, council_name])
+            
+            elif kind == COUNCIL_STATS:
+                self.emit(["council_stats", parse_stats(match)])
+            
+            elif kind == WARD_ROW and current_council:
+                ward_name = clean_text(match.group(2))
                 
-                if council_section and current_region:
-                    council_full = clean_text(council_section.group(1))
-                    
-                    # Determine council type and name
-                    if 'DISTRICT COUNCIL' in council_full:
-                        council_type = 'district_council'
-                        council_name = council_full.replace('DISTRICT COUNCIL', '').strip().title()
-                    elif 'MUNICIPAL COUNCIL' in council_full or 'MUNICIPAL' in council_full:
-                        council_type = 'municipal_council'
-                        council_name = council_full.replace('MUNICIPAL COUNCIL', '').replace('MUNICIPAL', '').strip().title()
-                    elif 'TOWN COUNCIL' in council_full:
-                        council_type = 'town_council'
-                        council_name = council_full.replace('TOWN COUNCIL', '').strip().title()
-                    elif 'CITY COUNCIL' in council_full:
-                        council_type = 'city_council'
-                        council_name = council_full.replace('CITY COUNCIL', '').strip().title()
-                    else:
-                        i += 1
-                        continue
-                    
-                    # Check if council already exists
-                    existing_council = None
-                    for council_item in current_region["councils"]:
-                        if council_item["type"] == council_type and council_item["name"] == council_name:
-                            existing_council = council_item
-                            break
-                    
-                    if not existing_council:
-                        current_council = {
-                            "type": council_type,
-                            "name": council_name,
-                            "population": {},
-                            "wards": []
-                        }
-                        current_region["councils"].append(current_council)
-                        print(f"  Found {council_type}: {council_name}")
-                    else:
-                        current_council = existing_council
-                    
-                    i += 1
+                # Skip if it looks like a council or district
+                skip_terms = ['Council', 'Municipal', 'District', 'Region', 'Town', 'City']
+                if any(term in ward_name for term in skip_terms):
                     continue
                 
-                # Extract council-level statistics (first line after council header in table)
-                if current_council and not current_council.get("population"):
-                    # Look for lines with council name followed by numbers
-                    council_stats = re.match(r'^' + re.escape(current_council['name']) + r'\s+(?:District|Municipal|Town|City)?\s*(?:Council)?\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line, re.IGNORECASE)
-                    if council_stats:
-                        current_council["population"] = {
-                            "both_sexes": parse_number(council_stats.group(1)),
-                            "male": parse_number(council_stats.group(2)),
-                            "female": parse_number(council_stats.group(3)),
-                            "sex_ratio": parse_number(council_stats.group(4)),
-                            "households": parse_number(council_stats.group(5)),
-                            "average_household_size": parse_number(council_stats.group(6))
-                        }
-                        print(f"    Council stats: {current_council['population']['both_sexes']:,} people")
-                        i += 1
-                        continue
-                
-                # Detect ward entries with population data (numbered list at start of line)
-                ward_match = re.match(r'^(\d+)\.\s+([A-Z][a-zA-Z\s\'\-]+?)\s+([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)', line)
-                
-                if ward_match and current_council:
-                    ward_name = clean_text(ward_match.group(2))
-                    
-                    # Skip if it looks like a council or district
-                    skip_terms = ['Council', 'Municipal', 'District', 'Region', 'Town', 'City']
-                    if any(term in ward_name for term in skip_terms):
-                        i += 1
-                        continue
-                    
-                    # Skip very short names
-                    if len(ward_name) < 3:
-                        i += 1
-                        continue
-                    
-                    # Check if ward already exists
-                    ward_exists = any(w["name"] == ward_name for w in current_council["wards"])
-                    
-                    if not ward_exists:
-                        ward_data = {
-                            "name": ward_name,
-                            "population": {
-                                "both_sexes": parse_number(ward_match.group(3)),
-                                "male": parse_number(ward_match.group(4)),
-                                "female": parse_number(ward_match.group(5)),
-                                "sex_ratio": parse_number(ward_match.group(6)),
-                                "households": parse_number(ward_match.group(7)),
-                                "average_household_size": parse_number(ward_match.group(8))
-                            }
-                        }
-                        current_council["wards"].append(ward_data)
+                # Skip very short names
+                if len(ward_name) < 3:
+                    continue
                 
-                i += 1
-    
-    return data
+                # Duplicates are dropped in apply(), so a page's records don't depend on earlier pages
+                self.emit(["ward", ward_name, parse_stats(match, first_group=3)])
 
-def main():
-    pdf_path = '/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf'
-    output_path = '/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/population_stats.json'
-    
-    print("="*80)
-    print("Extracting population statistics from Tanzania Population Distribution Report")
-    print(f"Processing pages 54-286 (population data pages)")
-    print("="*80)
-    
-    data = extract_population_stats(pdf_path, start_page=54, end_page=286)
-    
-    print("\n" + "="*80)
-    print("Extraction complete!")
-    print("="*80)
+    def new_region(self, region_name):
+        return {
+            "region": region_name,
+            "population": {},
+            "councils": []
+        }
+
+    def new_council(self, council_type, council_name):
+        return {
+            "type": council_type,
+            "name": council_name,
+            "population": {},
+            "wards": []
+        }
+
+    def council_id(self, council):
+        return council["type"], council["name"]
+
+    def new_ward(self, record):
+        return {
+            "name": record[1],
+            "population": record[2]
+        }
+
+    def apply_other(self, record):
+        kind = record[0]
+        
+        if kind == "region_stats":
+            # Only the first stats row after the region header counts
+            if not self.current_region.get("population"):
+                self.current_region["population"] = record[1]
+                print(f"  Region stats: {self.current_region['population']['both_sexes']:,} people")
+        
+        elif kind == "council_stats":
+            if not self.current_council.get("population"):
+                self.current_council["population"] = record[1]
+                print(f"    Council stats: {self.current_council['population']['both_sexes']:,} people")
+        
+        else:
+            super().apply_other(record)
+
+def extract_population_stats(pdf_path, start_page=54, end_page=286, workers=1, cache_path=None, on_region_complete=None,
+                             regions=None, table_mode=False, source_pages=None, profiler=NULL_PROFILER,
+                             page_numbers=None):
+    """
+    Extract population statistics from the PDF
+    Returns structured data with regions, councils, and wards
+    A source_pages dict is filled with the page each region, council and ward was found on
+    With regions, page_numbers are their pages if already resolved (see page_index.resolve_region_option)
+    """
+    return extract_regions(PopulationStatsParser, pdf_path, start_page, end_page, workers=workers, cache_path=cache_path,
+                           on_region_complete=on_region_complete, regions=regions, table_mode=table_mode,
+                           source_pages=source_pages, profiler=profiler, page_numbers=page_numbers)
+
+def print_summary(data):
+    """Print region, council, ward and population totals for extracted data"""
     print(f"Regions found: {len(data['regions'])}")
     
     total_councils = 0
@@ -252,13 +189,82 @@ def main():
     print(f"\nTotal councils: {total_councils}")
     print(f"Total wards: {total_wards}")
     print(f"Total population: {total_population:,}")
-    
-    # Save to JSON
+
+def save_json(data, output_path):
+    """Write extracted data as pretty-printed UTF-8 JSON"""
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract population statistics from the Tanzania Population Distribution Report")
+    add_extraction_arguments(parser, columns=True)
+    parser.add_argument('--output', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/population_stats.json')
+    args = parser.parse_args()
+    check_extraction_arguments(parser, args)
+    pdf_path = args.pdf
+    cache_path = cache_path_option(args)
+    output_path = args.output
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    with profiler.stage('region_index'):
+        args.region, region_pages = resolve_region_option(parser, pdf_path, args.region)
+    
+    print("="*80)
+    print("Extracting population statistics from Tanzania Population Distribution Report")
+    print(f"Processing pages 54-286 (population data pages)")
+    if args.workers > 1:
+        print(f"Using {args.workers} worker processes")
+    print("="*80)
+    
+    writer = None
+    if args.ndjson:
+        writer = NDJSONWriter(output_path)
+    elif args.stream:
+        writer = StreamingJSONWriter(output_path, DATA_HEADER)
+    
+    source_pages = {}
+    try:
+        data = extract_population_stats(pdf_path, start_page=54, end_page=286, workers=args.workers, cache_path=cache_path,
+                                        on_region_complete=profiler.wrap('json', writer.write_region if writer else None),
+                                        regions=args.region, page_numbers=region_pages, table_mode=args.table_mode,
+                                        source_pages=source_pages, profiler=profiler)
+    except BaseException as error:
+        # Keep the previous output rather than a truncated one
+        if writer:
+            writer.discard()
+        if isinstance(error, MissingRegionError):
+            sys.exit(f"Error: {error}")
+        raise
+    
+    print("\n" + "="*80)
+    print("Extraction complete!")
+    print("="*80)
+    if writer:
+        with profiler.stage('json'):
+            writer.close()
+        print(f"Regions written: {writer.regions_written}")
+    else:
+        print_summary(data)
+        with profiler.stage('json'):
+            save_json(data, output_path)
     
     print(f"\n✓ Data saved to: {output_path}")
+    
+    if args.profile:
+        report = profiler.save(args.profile, script="extract_population_stats", pdf=pdf_path, workers=args.workers,
+                               table_mode=args.table_mode, region_filter=args.region)
+        print("\nProfile:")
+        print_profile(report)
+        print(f"✓ Profile saved to: {args.profile}")
+    
+    mismatches = []
+    if args.columns or args.validate:
+        # NumPy is only needed for the columnar export and validation
+        from validate_stats import run_columns_and_validation
+        mismatches = run_columns_and_validation(data, source_pages, args.columns, args.validate)
     print("="*80)
+    
+    if mismatches:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Incremental re-extraction for extract_all.py
+A manifest records, for every page, the hash of its extracted text, the
+extractor version that read it and the records each parser produced from it.
+A rerun re-parses only the pages whose text, parser version or starting parser
+state changed, replays the saved
+records for every other page, and so splices new results into the full output
+"""
+
+import hashlib
+import json
+import os
+
+import pdfplumber
+
+import extract_admin_units
+import extract_population_stats
+import line_classifier
+import region_parser
+from page_cache import extractor_version, file_sha256, open_cache
+from page_index import check_regions_found, select_region_pages
+from pdf_pages import count_pages, iter_page_texts, page_reader
+
+MANIFEST_FORMAT = 1
+
+def parser_version(module):
+    """
+    Hash of a parser module's source together with the shared parser base and line classifier
+    Any edit to the parsing rules changes the version and invalidates saved records
+    """
+    digest = hashlib.sha256()
+    for source in (module, region_parser, line_classifier):
+        with open(source.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def is_current(saved, version, entry):
+    """True if a page's saved parser records were made by this parser version from the same starting state"""
+    return saved is not None and saved["version"] == version and saved["entry"] == entry
+
+def text_hash(text):
+    """Short content hash of a page's extracted text"""
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()[:16]
+
+def default_manifest_path(output_path):
+    """Manifest stored next to an output file, e.g. out/population_stats.json -> out/extract_manifest.json"""
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), 'extract_manifest.json')
+
+def load_manifest(manifest_path, pdf_hash):
+    """Load the manifest, or start a new one if it is missing or belongs to another PDF"""
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("format") == MANIFEST_FORMAT and manifest.get("pdf_hash") == pdf_hash:
+            return manifest
+    return {"format": MANIFEST_FORMAT, "pdf_hash": pdf_hash, "pages": {}}
+
+def save_manifest(manifest_path, manifest):
+    """Write the manifest atomically so an interrupted run leaves the old one intact"""
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, manifest_path)
+
+def extract_incremental(pdf_path, manifest_path, start_page=54, end_page=286, workers=1, cache_path=None,
+                        regions=None, admin_on_region_complete=None, stats_on_region_complete=None, table_mode=False,
+                        stats_source_pages=None, page_numbers=None):
+    """
+    Extract both datasets, re-parsing only pages that changed since the manifest was written
+    With regions, only those regions' pages are read from the PDF. Every other page
+    is checked against its cached text and replayed from the manifest when it is
+    unchanged; a page that can't be replayed safely is read and parsed again, so the
+    output still covers the whole report; page_numbers are the regions' pages if
+    already resolved (see page_index.resolve_region_option)
+    Returns (admin_units_data, population_stats_data, report)
+    """
+    cache = open_cache(cache_path, pdf_path) if cache_path else None
+    if cache:
+        pdf_hash = cache.pdf_hash
+        page_count = cache.get_page_count()
+        cache.close()
+    else:
+        # An unusable cache has already been reported; the rest of the run goes without it
+        cache_path = None
+        pdf_hash = file_sha256(pdf_path)
+        page_count = None
+    if page_count is None:
+        page_count = count_pages(pdf_path)
+
+    all_pages = list(range(start_page, min(end_page, page_count) + 1))
+    if regions and page_numbers is None:
+        regions, page_numbers = select_region_pages(pdf_path, regions, start_page, end_page)
+    if regions:
+        selected_pages = page_numbers
+    else:
+        selected_pages = all_pages
+    selected = set(selected_pages)
+
+    manifest = load_manifest(manifest_path, pdf_hash)
+    parsers = {
+        "admin": (extract_admin_units.AdminUnitsParser(admin_on_region_complete), parser_version(extract_admin_units)),
+        "stats": (extract_population_stats.PopulationStatsParser(stats_on_region_complete, stats_source_pages),
+                  parser_version(extract_population_stats)),
+    }
+    report = {"parsed": 0, "replayed": 0}
+    # Records parsed from text-mode pages don't hold for table-mode text, and vice versa
+    text_source = extractor_version(table_mode)
+
+    texts = iter_page_texts(pdf_path, workers=workers, cache_path=cache_path, page_numbers=selected_pages,
+                            table_mode=table_mode)
+    # Unselected pages are checked against the cached text, which costs a single row read
+    cache = open_cache(cache_path, pdf_path, table_mode) if cache_path else None
+    # Opened only if an unselected page has to be read from the PDF
+    pdf = None
+
+    try:
+        for page_number in all_pages:
+            saved_page = manifest["pages"].get(str(page_number), {})
+
+            if page_number in selected:
+                _, text = next(texts)
+            else:
+                cached = cache.get_pages(page_number, page_number) if cache else {}
+                if page_number in cached:
+                    text = cached[page_number]
+                elif saved_page.get("text_source") == text_source and all(is_current(saved_page.get(name), version, parser.state_key())
+                         for name, (parser, version) in parsers.items()):
+                    # Nothing to check the text against, and the saved records still apply
+                    for name, (parser, version) in parsers.items():
+                        parser.replay_page(saved_page[name]["records"], page_number)
+                    report["replayed"] += 1
+                    continue
+                else:
+                    # The saved records are missing or stale, so the page is read and parsed again
+                    if pdf is None:
+                        pdf = pdfplumber.open(pdf_path)
+                        read_page = page_reader(table_mode)
+                    text = read_page(pdf, page_number)
+                    if cache:
+                        cache.put_pages([(page_number, text)])
+
+            page_hash = text_hash(text)
+            new_page = {"text_hash": page_hash, "text_source": text_source}
+            parsed = False
+
+            for name, (parser, version) in parsers.items():
+                saved = saved_page.get(name)
+                entry = parser.state_key()
+                if not is_current(saved, version, entry) or saved_page.get("text_hash") != page_hash:
+                    new_page[name] = {"version": version, "entry": entry,
+                                      "records": parser.record_page(text, page_number)}
+                    parsed = True
+                else:
+                    parser.replay_page(saved["records"], page_number)
+                    new_page[name] = saved
+
+            manifest["pages"][str(page_number)] = new_page
+            report["parsed" if parsed else "replayed"] += 1
+    finally:
+        if cache:
+            cache.close()
+        if pdf is not None:
+            pdf.close()
+
+    for parser, version in parsers.values():
+        parser.finish()
+
+    save_manifest(manifest_path, manifest)
+
+    if regions:
+        check_regions_found(parsers["admin"][0], regions)
+        check_regions_found(parsers["stats"][0], regions)
+
+    return parsers["admin"][0].data, parsers["stats"][0].data, report
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Incremental writers for extracted data
+Regions are written as soon as the parser completes them, either as the same
+pretty-printed JSON that json.dump produces or as NDJSON with one ward per line
+Both write to a temporary file that replaces the output only when complete
+"""
+
+import json
+import os
+
+from line_classifier import council_type_key
+
+class TempFileOutput:
+    """
+    Output written to <path>.tmp and moved into place by close()
+    A run that fails part-way calls discard(), leaving the previous file intact
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.temp_path = output_path + '.tmp'
+        self.f = open(self.temp_path, 'w', encoding='utf-8')
+
+    def close(self):
+        self.f.close()
+        os.replace(self.temp_path, self.output_path)
+
+    def discard(self):
+        self.f.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+class StreamingJSONWriter(TempFileOutput):
+    """
+    Writes {header fields..., "regions": [...]} one region at a time
+    The finished file is byte-identical to json.dump(data, f, ensure_ascii=False, indent=2)
+    """
+
+    def __init__(self, output_path, header):
+        super().__init__(output_path)
+        self.regions_written = 0
+        self.f.write("{\n")
+        for key, value in header.items():
+            self.f.write(f"  {json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)},\n")
+        self.f.write('  "regions": ')
+
+    def write_region(self, region):
+        text = json.dumps(region, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        self.f.write("[\n    " if self.regions_written == 0 else ",\n    ")
+        self.f.write(text)
+        self.f.flush()
+        self.regions_written += 1
+
+    def close(self):
+        self.f.write("[]\n}" if self.regions_written == 0 else "\n  ]\n}")
+        super().close()
+
+class NDJSONWriter(TempFileOutput):
+    """
+    Writes one JSON object per ward, each carrying its region and council
+    Works for both dataset.json regions ("data" lists of ward names) and
+    population_stats.json regions ("councils" lists of ward dicts)
+    """
+
+    def __init__(self, output_path):
+        super().__init__(output_path)
+        self.regions_written = 0
+        self.wards_written = 0
+
+    def write_region(self, region):
+        for council_type, council_name, ward in iter_region_wards(region):
+            record = {"region": region["region"], "council_type": council_type, "council": council_name}
+            if isinstance(ward, dict):
+                record.update(ward)
+            else:
+                record["name"] = ward
+            self.f.write(json.dumps(record, ensure_ascii=False))
+            self.f.write("\n")
+            self.wards_written += 1
+        self.f.flush()
+        self.regions_written += 1
+
+def iter_region_wards(region):
+    """Yield (council_type, council_name, ward) for either output layout"""
+    if "councils" in region:
+        for council in region["councils"]:
+            for ward in council["wards"]:
+                yield council["type"], council["name"], ward
+    else:
+        for council in region["data"]:
+            council_type = council_type_key(council)
+            for ward in council["wards"]:
+                yield council_type, council[council_type], ward
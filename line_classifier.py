@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Table-driven line classifier shared by the extraction parsers
+Every pattern is compiled once at import time, and cheap string checks run
+before any regex so most lines are classified without touching the regex engine
+"""
+
+import re
+
+REGION_HEADER = 'region_header'
+COUNCIL_HEADER = 'council_header'
+REGION_STATS = 'region_stats'
+COUNCIL_STATS = 'council_stats'
+WARD_ROW = 'ward_row'
+NOISE = 'noise'
+
+# Six statistics columns: both sexes, male, female, sex ratio, households, average household size
+STATS_COLUMNS = r'([\d,]+)\s+([\d,]+)\s+([\d,]+)\s+(\d+)\s+([\d,]+)\s+([\d.]+)'
+# Keys of a population dict, in column order
+STAT_FIELDS = ('both_sexes', 'male', 'female', 'sex_ratio', 'households', 'average_household_size')
+# The counts that add up from wards to councils to regions
+SUM_FIELDS = ('both_sexes', 'male', 'female', 'households')
+
+# Council section headers (e.g., "14.1 NZEGA TOWN COUNCIL")
+COUNCIL_HEADER_PATTERN = re.compile(r'^\d+\.\s*\d+\s+([A-Z][A-Z\s\'\-]+(?:DISTRICT|MUNICIPAL|TOWN|CITY)\s+COUNCIL)')
+
+# Stats rows are matched from the end of the region/council name, which is checked with startswith
+REGION_STATS_TAIL = re.compile(r'\s+Region\s+' + STATS_COLUMNS)
+COUNCIL_STATS_TAIL = re.compile(r'\s+(?:District|Municipal|Town|City)?\s*(?:Council)?\s+' + STATS_COLUMNS, re.IGNORECASE)
+
+# Region header patterns, tried in order against a line joined with the next one
+ADMIN_REGION_PATTERNS = (
+    # Specific pattern first: "by Council, RegionName Region"
+    re.compile(r'by\s+Council[,\s]+([A-Z][a-zA-Z\s]+?)\s+Region[;\s,]+2022\s+PHC', re.IGNORECASE),
+    # Fallback to less specific pattern
+    re.compile(r'Table\s+\d+\.\s*0[:\s]+.*?([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', re.IGNORECASE),
+)
+STATS_REGION_PATTERNS = (
+    re.compile(r'by\s+Council[,\s]+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', re.IGNORECASE),
+    # Fallback pattern for when region name comes right before "Region"
+    re.compile(r'Council\s+([A-Z][a-zA-Z\s]{3,25}?)\s+Region[;\s,]+2022\s+PHC', re.IGNORECASE),
+)
+
+def clean_text(text):
+    """Clean and normalize text"""
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+def is_stats_region_name(name):
+    """
+    Reject header fragments a STATS_REGION_PATTERNS match can pick up instead of a region name
+    Shared by the population-stats parser and the page-range index so both agree on region names
+    """
+    return not ('Household' in name or 'Number' in name or 'Average' in name or 'Size' in name or 'by' in name.lower())
+
+# Ward entries (numbered list at start of line); the stats variant requires the six columns
+ADMIN_WARD_PATTERN = re.compile(r'^(\d+)\.\s+([A-Z][a-zA-Z\s\'\-]+?)(?:\s+\d|$)')
+STATS_WARD_PATTERN = re.compile(r'^(\d+)\.\s+([A-Z][a-zA-Z\s\'\-]+?)\s+' + STATS_COLUMNS)
+
+# Ward rows whose cells were already assigned by table_words.py are written as
+# "index|name|both sexes|male|female|sex ratio|households|average household size"
+CELL_SEPARATOR = '|'
+TABLE_ROW_FIELDS = 8
+
+COUNCIL_TYPES = (
+    ('DISTRICT COUNCIL', 'district_council'),
+    ('MUNICIPAL', 'municipal_council'),
+    ('TOWN COUNCIL', 'town_council'),
+    ('CITY COUNCIL', 'city_council'),
+)
+
+def split_council_name(council_full):
+    """
+    Determine council type and name from a cleaned council header
+    Returns (council_type, council_name), or (None, None) if no type matches
+    """
+    for marker, council_type in COUNCIL_TYPES:
+        if marker in council_full:
+            if council_type == 'municipal_council':
+                name = council_full.replace('MUNICIPAL COUNCIL', '').replace('MUNICIPAL', '')
+            else:
+                name = council_full.replace(marker, '')
+            return council_type, name.strip().title()
+    return None, None
+
+def council_type_key(council):
+    """Council type of a dataset.json council, the key besides "wards", e.g. {"district_council": "Kondoa", "wards": [...]}"""
+    return next(key for key in council if key != "wards")
+
+class TableRowMatch:
+    """
+    Stands in for a ward-row regex match on a pre-split table row
+    group(1) is the index, group(2) the name and group(3)..group(8) the statistics cells
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def group(self, index):
+        return self.cells[index - 1]
+
+def match_table_row(line, stats_cells):
+    """Return a TableRowMatch if the line is a pre-split ward row with its statistics cells filled, else None"""
+    cells = line.split(CELL_SEPARATOR)
+    if len(cells) != TABLE_ROW_FIELDS or not cells[0].isdigit() or not cells[1][:1].isalpha():
+        return None
+    if not all(cells[2:2 + stats_cells]):
+        return None
+    return TableRowMatch(cells)
+
+class LineClassifier:
+    """
+    Sorts a report line into one of REGION_HEADER, REGION_STATS, COUNCIL_HEADER,
+    COUNCIL_STATS, WARD_ROW or NOISE, returning the kind and its regex match
+    """
+
+    def __init__(self, region_patterns, ward_pattern, stats_cells=0):
+        self.region_patterns = region_patterns
+        self.ward_pattern = ward_pattern
+        # Statistics cells a pre-split ward row must have to count as a ward row
+        self.stats_cells = stats_cells
+
+    def classify(self, line, next_line=None, region_name=None, council_name=None):
+        """
+        Classify a stripped, non-empty line
+        next_line is the stripped following line on the page, if any; region_name and
+        council_name are the current region/council and enable the stats-row checks
+        """
+        # Table rows split by column position need no regex at all
+        if CELL_SEPARATOR in line:
+            match = match_table_row(line, self.stats_cells)
+            if match:
+                return WARD_ROW, match
+
+        # Every region header pattern needs a literal "2022" in the joined text
+        if '2022' in line or (next_line and '2022' in next_line):
+            combined = line + " " + next_line if next_line is not None else line
+            for pattern in self.region_patterns:
+                match = pattern.search(combined)
+                if match:
+                    return REGION_HEADER, match
+
+        if region_name and line.startswith(region_name):
+            match = REGION_STATS_TAIL.match(line, len(region_name))
+            if match:
+                return REGION_STATS, match
+
+        # Council headers and ward rows both start with a number, stats rows with a name
+        if line[0].isdigit():
+            if 'COUNCIL' in line:
+                match = COUNCIL_HEADER_PATTERN.match(line)
+                if match:
+                    return COUNCIL_HEADER, match
+            match = self.ward_pattern.match(line)
+            if match:
+                return WARD_ROW, match
+        elif council_name and line[:len(council_name)].lower() == council_name.lower():
+            match = COUNCIL_STATS_TAIL.match(line, len(council_name))
+            if match:
+                return COUNCIL_STATS, match
+
+        return NOISE, None
+
+ADMIN_CLASSIFIER = LineClassifier(ADMIN_REGION_PATTERNS, ADMIN_WARD_PATTERN)
+STATS_CLASSIFIER = LineClassifier(STATS_REGION_PATTERNS, STATS_WARD_PATTERN, stats_cells=6)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP lookup service over population_stats.json
+The dataset is loaded once into population_query's indexes; region, council
+and ward lookups are dict hits, and rollups (e.g. all town councils in a
+region) are computed on first request and kept in a bounded LRU cache.
+Standard library only: GET requests with JSON responses and keep-alive
+"""
+
+import argparse
+import asyncio
+import json
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+from line_classifier import SUM_FIELDS
+from population_query import PopulationIndex
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+class NotFound(Exception):
+    """Raised by a route when the requested unit does not exist"""
+
+class LookupService:
+    """
+    Request routing and lookups, independent of the HTTP transport
+    handle() takes a path and query dict and returns (status, payload)
+    """
+
+    def __init__(self, index, cache_size=1024):
+        self.index = index
+        # Rollups are cached per (region, council type); lru_cache keeps the most recent cache_size
+        self.aggregate = lru_cache(maxsize=cache_size)(self.compute_aggregate)
+        self.routes = {
+            '/health': self.health,
+            '/regions': self.regions,
+            '/region': self.region,
+            '/council': self.council,
+            '/ward': self.ward,
+            '/search': self.search,
+            '/aggregate': self.aggregate_route,
+        }
+
+    def handle(self, path, query):
+        route = self.routes.get(path)
+        if route is None:
+            return 404, {"error": f"unknown path {path}"}
+        try:
+            return 200, route(query)
+        except NotFound as e:
+            return 404, {"error": str(e)}
+        except (KeyError, ValueError) as e:
+            return 400, {"error": f"bad request: {e}"}
+
+    def health(self, query):
+        info = self.aggregate.cache_info()
+        return {
+            "status": "ok",
+            "regions": len(self.index.regions_by_name),
+            "aggregate_cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+        }
+
+    def regions(self, query):
+        return [
+            {"region": region["region"], "population": region.get("population", {}), "councils": len(region["councils"])}
+            for region in self.index.data["regions"]
+        ]
+
+    def region(self, query):
+        region = self.index.get_region(query['name'])
+        if region is None:
+            raise NotFound(f"region {query['name']!r} not found")
+        return {
+            "region": region["region"],
+            "population": region.get("population", {}),
+            "councils": [
+                {"type": council["type"], "name": council["name"], "population": council.get("population", {}),
+                 "wards": len(council["wards"])}
+                for council in region["councils"]
+            ]
+        }
+
+    def council(self, query):
+        council = self.index.get_council(query['region'], query['name'], query.get('type'))
+        if council is None:
+            raise NotFound(f"council {query['name']!r} not found in {query['region']!r}")
+        return dict(council, region=query['region'])
+
+    def ward(self, query):
+        """Exact lookup with region and council, else every ward of that name (falling back to normalized names)"""
+        name = query['name']
+        if query.get('region') and query.get('council'):
+            record = self.index.get_ward(name, query['council'], query['region'])
+            records = [record] if record else []
+        else:
+            records = self.filter_wards(self.index.find_wards(name), query)
+        if not records:
+            # Filtered before falling back, so a spelling variant is still found within a region or council
+            records = self.filter_wards(self.index.find_wards_fuzzy(name), query)
+        if not records:
+            raise NotFound(f"ward {name!r} not found")
+        return [record._asdict() for record in records]
+
+    @staticmethod
+    def filter_wards(records, query):
+        """Keep the WardRecords in the query's region and council, if given"""
+        return [
+            record for record in records
+            if (not query.get('region') or record.region == query['region'])
+            and (not query.get('council') or record.council == query['council'])
+        ]
+
+    def search(self, query):
+        limit = int(query.get('limit', 20))
+        if limit <= 0:
+            raise ValueError(f"limit must be positive, got {limit}")
+        return [record._asdict() for record in self.index.search_wards(query['prefix'], limit)]
+
+    def aggregate_route(self, query):
+        region_name = query.get('region')
+        if region_name and self.index.get_region(region_name) is None:
+            raise NotFound(f"region {region_name!r} not found")
+        council_type = query.get('type')
+        # Checked before the cached call so unknown types don't take cache slots
+        if council_type and council_type not in self.index.councils_by_type:
+            raise ValueError(f"unknown council type {council_type!r}; "
+                             f"known types: {', '.join(sorted(self.index.councils_by_type))}")
+        return self.aggregate(region_name, council_type)
+
+    def compute_aggregate(self, region_name=None, council_type=None):
+        """
+        Sum council statistics over a region and/or council type (the whole country when both are None)
+        Councils without statistics are counted in councils_missing_stats rather than summed
+        """
+        if council_type:
+            councils = [council for _, council in self.index.councils_of_type(council_type, region_name)]
+        elif region_name:
+            councils = list(self.index.get_region(region_name)["councils"])
+        else:
+            councils = [council for region in self.index.data["regions"] for council in region["councils"]]
+
+        totals = {field: 0 for field in SUM_FIELDS}
+        missing = 0
+        for council in councils:
+            population = council.get("population") or {}
+            if not population:
+                missing += 1
+                continue
+            for field in SUM_FIELDS:
+                totals[field] += population.get(field) or 0
+
+        return {
+            "region": region_name,
+            "type": council_type,
+            "councils": len(councils),
+            "councils_missing_stats": missing,
+            "wards": sum(len(council["wards"]) for council in councils),
+            "population": totals
+        }
+
+async def read_request(reader):
+    """Read one request; returns (method, target, headers) or None when the client has closed"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    # Lookups are GET-only, but a body must still be drained to keep the connection usable
+    length = int(headers.get('content-length', 0))
+    if length:
+        await reader.readexactly(length)
+    return method, target, headers
+
+def encode_response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode('latin-1') + body
+
+def make_handler(service):
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(encode_response(400, {"error": "malformed request"}, False))
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                if method != 'GET':
+                    status, payload = 405, {"error": "only GET is supported"}
+                else:
+                    url = urlsplit(target)
+                    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    status, payload = service.handle(url.path, query)
+
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(make_handler(service), host, port)
+    print(f"Serving on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve population lookups and rollups over HTTP")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8022)
+    parser.add_argument('--cache-size', type=int, default=1024, help='Aggregates kept in the LRU cache')
+    args = parser.parse_args()
+
+    service = LookupService(PopulationIndex.load(args.input), args.cache_size)
+    print(f"Loaded {len(service.index.regions_by_name)} regions from {args.input}")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Fuzzy name matching for reconciling records against the dataset
+Every region, council and ward name is indexed by character trigrams once;
+a query collects candidates from the trigram postings of its scope (the whole
+country, a region, or one council), reranks the best few by edit distance
+and returns the closest names. Spelling variants such as "Kondoa Mjini",
+"KONDOA-MJINI", "Kondoa Mjin" and "Konoda Mjini" all land on the same ward
+"""
+
+import heapq
+import json
+from collections import Counter, namedtuple
+from functools import lru_cache
+from itertools import chain
+
+from line_classifier import council_type_key
+from population_query import normalize_name
+
+NameEntry = namedtuple('NameEntry', ['level', 'region', 'council_type', 'council', 'name'])
+Match = namedtuple('Match', ['score', 'entry'])
+
+LEVELS = ('region', 'council', 'ward')
+
+# Trigram candidates reranked by edit distance per query
+RERANK_CANDIDATES = 8
+DEFAULT_MIN_SCORE = 0.75
+
+def trigrams(key):
+    """Character trigrams of a match key, padded so short names still produce some"""
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a, b, limit=None):
+    """
+    Edit distance counting an insertion, deletion, substitution or swap of neighbouring letters as one edit
+    With a limit, gives up and returns limit + 1 as soon as the distance must exceed it
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is None:
+        limit = len(a)
+    if len(a) - len(b) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        # A swap can reach back two rows, so stop only once both are past the limit
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+def similarity(a, b, min_score=0.0):
+    """1.0 for identical keys, falling towards 0.0 with each edit; 0.0 once below min_score"""
+    if a == b:
+        return 1.0
+    longest = max(len(a), len(b))
+    limit = int((1.0 - min_score) * longest + 1e-9)
+    distance = edit_distance(a, b, limit)
+    return 0.0 if distance > limit else 1.0 - distance / longest
+
+def stats_entries(data):
+    """NameEntry for every region, council and ward in population_stats.json-shaped data"""
+    for region in data["regions"]:
+        region_name = region["region"]
+        yield NameEntry('region', region_name, None, None, region_name)
+        for council in region["councils"]:
+            yield NameEntry('council', region_name, council["type"], None, council["name"])
+            for ward in council["wards"]:
+                yield NameEntry('ward', region_name, council["type"], council["name"], ward["name"])
+
+def dataset_entries(data):
+    """NameEntry for every region, council and ward in dataset.json-shaped data"""
+    for region in data["regions"]:
+        region_name = region["region"]
+        yield NameEntry('region', region_name, None, None, region_name)
+        for council in region["data"]:
+            council_type = council_type_key(council)
+            council_name = council[council_type]
+            yield NameEntry('council', region_name, council_type, None, council_name)
+            for ward in council["wards"]:
+                yield NameEntry('ward', region_name, council_type, council_name, ward)
+
+class NameMatcher:
+    """
+    Trigram index over region, council and ward names
+    Postings are kept per scope, (level, region, council) with None for "any",
+    so a query scoped to a council only looks at that council's wards
+    """
+
+    def __init__(self, entries, cache_size=65536):
+        self.entries = list(entries)
+        self.keys = [normalize_name(entry.name) for entry in self.entries]
+        self.gram_counts = [len(trigrams(key)) for key in self.keys]
+        self.postings = {}
+        self.exact = {}
+
+        for entry_id, (entry, key) in enumerate(zip(self.entries, self.keys)):
+            region_key = normalize_name(entry.region)
+            council_key = normalize_name(entry.council) if entry.council else None
+            scopes = [(entry.level, None, None), (entry.level, region_key, None)]
+            if council_key:
+                # A council given without its region is looked up across every region
+                scopes += [(entry.level, region_key, council_key), (entry.level, None, council_key)]
+            for scope in scopes:
+                self.exact.setdefault(scope + (key,), []).append(entry_id)
+                grams = self.postings.setdefault(scope, {})
+                for gram in trigrams(key):
+                    grams.setdefault(gram, []).append(entry_id)
+
+        # Batch joins repeat the same names many times, so whole lookups are memoized
+        self.lookup = lru_cache(maxsize=cache_size)(self.compute_matches)
+
+    @classmethod
+    def load(cls, stats_path='population_stats.json', dataset_path=None, cache_size=65536):
+        """Index population_stats.json, plus the dataset.json spellings when dataset_path is given"""
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            entries = list(stats_entries(json.load(f)))
+        if dataset_path:
+            with open(dataset_path, 'r', encoding='utf-8') as f:
+                entries.extend(dataset_entries(json.load(f)))
+        # Both files spell most names the same way; keep one entry per distinct spelling
+        return cls(dict.fromkeys(entries), cache_size)
+
+    def compute_matches(self, key, level, region_key, council_key, limit, min_score):
+        """Uncached lookup on pre-normalized keys; returns a tuple of Match sorted best first"""
+        scope = (level, region_key, council_key)
+        exact = self.exact.get(scope + (key,))
+        if exact and limit <= len(exact):
+            return tuple(Match(1.0, self.entries[entry_id]) for entry_id in exact[:limit])
+
+        grams = trigrams(key)
+        postings = self.postings.get(scope)
+        if not postings:
+            return ()
+        shared = Counter(chain.from_iterable(postings.get(gram, ()) for gram in grams))
+
+        # Dice coefficient on trigram sets picks the candidates worth an edit-distance check
+        query_size = len(grams)
+        candidates = heapq.nlargest(
+            max(RERANK_CANDIDATES, limit), shared,
+            key=lambda entry_id: shared[entry_id] / (query_size + self.gram_counts[entry_id])
+        )
+
+        matches = []
+        for entry_id in candidates:
+            score = similarity(key, self.keys[entry_id], min_score)
+            if score >= min_score:
+                matches.append(Match(round(score, 4), self.entries[entry_id]))
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return tuple(matches[:limit])
+
+    def match(self, name, level='ward', region=None, council=None, limit=1, min_score=DEFAULT_MIN_SCORE):
+        """
+        Return up to `limit` Match(score, entry) for a name, best first
+        region and council narrow the search to one region or one council's wards;
+        a council given without a region matches that council name in any region
+        """
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+        return list(self.lookup(
+            normalize_name(name), level,
+            normalize_name(region) if region else None,
+            normalize_name(council) if council else None,
+            limit, min_score
+        ))
+
+    def match_batch(self, rows, level='ward', min_score=DEFAULT_MIN_SCORE):
+        """
+        Best Match (or None) for every row of a batch join
+        Rows are names, or (name, region) / (name, region, council) tuples to scope each lookup
+        """
+        results = []
+        for row in rows:
+            if isinstance(row, str):
+                name, region, council = row, None, None
+            else:
+                name, region, council = (tuple(row) + (None, None))[:3]
+            matches = self.match(name, level, region, council, 1, min_score)
+            results.append(matches[0] if matches else None)
+        return results
+
+def load(stats_path='population_stats.json', dataset_path=None):
+    """Load the name index from population_stats.json (and optionally dataset.json)"""
+    return NameMatcher.load(stats_path, dataset_path)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of extracted page text for the census report PDF
+Pages are stored in SQLite, zlib-compressed, keyed by the PDF's SHA-256,
+the page number and the pdfplumber version (plus reading mode, and for table
+mode the table reader's source hash) that produced the text
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import zlib
+
+import pdfplumber
+
+import table_words
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    pdf_hash TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    pdf_hash TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    extractor_version TEXT NOT NULL,
+    text BLOB,
+    PRIMARY KEY (pdf_hash, page_number, extractor_version)
+);
+"""
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def table_mode_version():
+    """
+    Short hash of the table reader's source
+    Table-mode text is rebuilt from word positions by table_words.py, so any
+    edit to it (tolerances, wrap merging) must invalidate cached pages
+    """
+    with open(table_words.__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def extractor_version(table_mode=False):
+    """
+    Version string of the text a page read produces: the pdfplumber version,
+    plus the table reader's source hash for table mode
+    """
+    return pdfplumber.__version__ + (f'+table-{table_mode_version()}' if table_mode else '')
+
+def default_cache_path(pdf_path):
+    """Cache file stored next to the PDF, e.g. report.pdf -> report.pages.sqlite"""
+    return os.path.splitext(pdf_path)[0] + '.pages.sqlite'
+
+def open_cache(cache_path, pdf_path, table_mode=False):
+    """
+    Open the page cache, or warn and return None if it can't be created or written
+    (e.g. the default location next to a PDF in a read-only directory), so the
+    run carries on without a cache instead of failing
+    """
+    try:
+        return PageCache(cache_path, pdf_path, table_mode)
+    except sqlite3.Error as error:
+        print(f"Warning: page cache {cache_path} is not usable ({error}); extracting without it", file=sys.stderr)
+        return None
+
+class PageCache:
+    """
+    Page-text cache for one PDF file
+    A cached page whose text was empty is stored as NULL and returned as None
+    """
+
+    def __init__(self, cache_path, pdf_path, table_mode=False):
+        self.pdf_hash = file_sha256(pdf_path)
+        # Table-mode text is a different rendering of the page, so it is cached separately
+        self.version = extractor_version(table_mode)
+        self.conn = sqlite3.connect(cache_path)
+        try:
+            self.conn.executescript(SCHEMA)
+            # A no-op write, so a read-only cache fails here rather than part-way through a run
+            with self.conn:
+                self.conn.execute("DELETE FROM documents WHERE 0")
+        except sqlite3.Error:
+            self.conn.close()
+            raise
+
+    def close(self):
+        self.conn.close()
+
+    def get_page_count(self):
+        """Return the cached page count, or None if this PDF has not been seen"""
+        row = self.conn.execute(
+            "SELECT page_count FROM documents WHERE pdf_hash = ?", (self.pdf_hash,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_page_count(self, page_count):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (pdf_hash, page_count) VALUES (?, ?)",
+                (self.pdf_hash, page_count)
+            )
+
+    def get_page_numbers(self, start_page, end_page):
+        """Return the set of cached page numbers in start_page..end_page, without reading their text"""
+        rows = self.conn.execute(
+            "SELECT page_number FROM pages "
+            "WHERE pdf_hash = ? AND extractor_version = ? AND page_number BETWEEN ? AND ?",
+            (self.pdf_hash, self.version, start_page, end_page)
+        )
+        return {page_number for page_number, in rows}
+
+    def get_pages(self, start_page, end_page):
+        """Return {page_number: text} for cached pages in start_page..end_page"""
+        rows = self.conn.execute(
+            "SELECT page_number, text FROM pages "
+            "WHERE pdf_hash = ? AND extractor_version = ? AND page_number BETWEEN ? AND ?",
+            (self.pdf_hash, self.version, start_page, end_page)
+        )
+        return {
+            page_number: zlib.decompress(blob).decode('utf-8') if blob is not None else None
+            for page_number, blob in rows
+        }
+
+    def put_pages(self, pages):
+        """Store an iterable of (page_number, text) pairs"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (pdf_hash, page_number, extractor_version, text) VALUES (?, ?, ?, ?)",
+                [
+                    (self.pdf_hash, page_number, self.version,
+                     zlib.compress(text.encode('utf-8')) if text is not None else None)
+                    for page_number, text in pages
+                ]
+            )
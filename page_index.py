@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Region -> page-range index for the census report
+A fast pre-pass reads page text with pypdfium2 (installed with pdfplumber)
+and finds the "by Council, <Region> Region; 2022 PHC" table headers, so a
+run limited to a few regions only sends their pages through pdfplumber
+"""
+
+import argparse
+
+import pypdfium2
+
+from line_classifier import STATS_REGION_PATTERNS, clean_text, is_stats_region_name
+
+def scan_region_headers(pdf, start_page=54, end_page=286):
+    """Yield (page_number, region_name) for every region table header of an open pypdfium2 document, in page order"""
+    for page_number in range(start_page, min(end_page, len(pdf)) + 1):
+        page = pdf[page_number - 1]
+        textpage = page.get_textpage()
+        text = clean_text(textpage.get_text_range())
+        textpage.close()
+        page.close()
+        if '2022' not in text:
+            continue
+        for pattern in STATS_REGION_PATTERNS:
+            for match in pattern.finditer(text):
+                region_name = clean_text(match.group(1))
+                if is_stats_region_name(region_name):
+                    yield page_number, region_name
+
+def build_region_index(pdf_path, start_page=54, end_page=286):
+    """
+    Return {region_name: (first_page, last_page)} in report order
+    A region runs from its first header page up to and including the page where
+    the next region's header appears, since a region can end part-way down a page
+    """
+    with pypdfium2.PdfDocument(pdf_path) as pdf:
+        headers = sorted(set(scan_region_headers(pdf, start_page, end_page)))
+        end_page = min(end_page, len(pdf))
+
+    first_pages = {}
+    last_header_pages = {}
+    for page_number, region_name in headers:
+        first_pages.setdefault(region_name, page_number)
+        last_header_pages[region_name] = page_number
+
+    index = {}
+    for region_name, first_page in first_pages.items():
+        last_page = end_page
+        for page_number, other_name in headers:
+            if page_number > last_header_pages[region_name] and other_name != region_name:
+                last_page = page_number
+                break
+        index[region_name] = (first_page, last_page)
+    return index
+
+def resolve_region_names(index, requested):
+    """
+    Match requested names case-insensitively against the index
+    Accepts repeated options and comma-separated lists; raises ValueError for unknown names
+    """
+    by_lower = {name.lower(): name for name in index}
+    resolved = []
+    for item in requested:
+        for name in item.split(','):
+            name = clean_text(name)
+            if not name:
+                continue
+            if name.lower() not in by_lower:
+                raise ValueError(f"Unknown region {name!r}; known regions: {', '.join(index)}")
+            if by_lower[name.lower()] not in resolved:
+                resolved.append(by_lower[name.lower()])
+    return resolved
+
+def pages_for_regions(index, region_names):
+    """Sorted page numbers covering every named region"""
+    pages = set()
+    for region_name in region_names:
+        first_page, last_page = index[region_name]
+        pages.update(range(first_page, last_page + 1))
+    return sorted(pages)
+
+def select_region_pages(pdf_path, requested, start_page=54, end_page=286):
+    """Resolve requested region names and return (region_names, page_numbers) to extract"""
+    index = build_region_index(pdf_path, start_page, end_page)
+    region_names = resolve_region_names(index, requested)
+    return region_names, pages_for_regions(index, region_names)
+
+def resolve_region_option(parser, pdf_path, requested, start_page=54, end_page=286):
+    """
+    Resolve --region names for an entry point before any output file is opened
+    Returns (region_names, page_numbers), or (None, None) without --region; the
+    extraction functions take both so the PDF is only indexed once per run.
+    An unknown name ends the run with a usage error that lists the known regions
+    """
+    if not requested:
+        return None, None
+    try:
+        return select_region_pages(pdf_path, requested, start_page, end_page)
+    except ValueError as error:
+        parser.error(str(error))
+
+def only_regions(region_names, on_region_complete):
+    """Wrap a region callback so that only the named regions reach it"""
+    if on_region_complete is None:
+        return None
+    wanted = {name.lower() for name in region_names}
+    
+    def callback(region):
+        if region["region"].lower() in wanted:
+            on_region_complete(region)
+    
+    return callback
+
+class MissingRegionError(ValueError):
+    """A requested region is in the page index but the parser produced no data for it"""
+
+def extracted_region_names(parser):
+    """
+    Every region a parser produced: those already streamed to on_region_complete
+    (and so dropped from parser.data) followed by those still in parser.data
+    """
+    return sorted(parser.completed_regions) + [region["region"] for region in parser.data["regions"]]
+
+def check_regions_found(parser, region_names):
+    """Raise MissingRegionError if the parser produced no data for a requested region"""
+    extracted = extracted_region_names(parser)
+    found = {name.lower() for name in extracted}
+    missing = [name for name in region_names if name.lower() not in found]
+    if missing:
+        raise MissingRegionError(
+            f"No data extracted for region {', '.join(map(repr, missing))}; "
+            f"regions extracted from its pages: {', '.join(extracted) or 'none'}"
+        )
+
+def filter_regions(parser, region_names):
+    """
+    Drop neighbouring regions picked up from shared boundary pages from parser.data
+    Streamed regions were already filtered by only_regions, so only the regions
+    still in memory are filtered here. Raises MissingRegionError when a requested
+    region produced no data, e.g. because the page index and the parser spell
+    its name differently
+    """
+    check_regions_found(parser, region_names)
+    wanted = {name.lower() for name in region_names}
+    parser.data["regions"] = [region for region in parser.data["regions"] if region["region"].lower() in wanted]
+    return parser.data
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the region -> page-range index of the census report")
+    parser.add_argument('--pdf', default='/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf')
+    parser.add_argument('--start-page', type=int, default=54)
+    parser.add_argument('--end-page', type=int, default=286)
+    args = parser.parse_args()
+
+    index = build_region_index(args.pdf, args.start_page, args.end_page)
+    for region_name, (first_page, last_page) in index.items():
+        print(f"{region_name}: pages {first_page}-{last_page} ({last_page - first_page + 1} pages)")
+    print(f"\nRegions indexed: {len(index)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Shared page-text reader for the Tanzania Population Distribution Report 2022
+Opens the PDF once and yields the extracted text of each page in the data range
+With workers > 1, page text is extracted in a process pool and yielded in page order
+With a cache path, previously extracted pages are served from the page-text cache
+With table_mode, ward rows are split into cells by word position (see table_words.py)
+Pages are released as soon as their text is read, so memory stays flat however long the PDF is
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+from page_cache import open_cache
+from profiler import NULL_PROFILER
+from table_words import LayoutCache, table_page_text
+
+# Chunks per worker; more chunks balance uneven pages better, fewer reduce PDF reopen cost
+CHUNKS_PER_WORKER = 4
+
+# Pages of cached text held in memory at once
+CACHE_READ_PAGES = 64
+
+def page_reader(table_mode=False):
+    """
+    Return a function that turns a 1-based page of an open PDF into text
+    The page is closed once read: pdfplumber keeps every page's parsed objects
+    alive through pdf.pages, so without it memory grows with each page visited
+    """
+    if table_mode:
+        # Column layouts are carried from page to page; a gap in the page numbers
+        # makes the reader look back for the table header, so each page reads the
+        # same however the pages are split between workers or served from the cache
+        layouts = LayoutCache()
+        return lambda pdf, page_number: table_page_text(pdf, page_number, layouts)
+
+    def read_page(pdf, page_number):
+        page = pdf.pages[page_number - 1]
+        try:
+            return page.extract_text()
+        finally:
+            page.close()
+
+    return read_page
+
+def extract_pages(pdf_path, page_numbers, table_mode=False):
+    """
+    Extract text for the given 1-based page numbers
+    Returns a list of (page_number, text); runs inside pool workers
+    """
+    read_page = page_reader(table_mode)
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_number in page_numbers:
+            results.append((page_number, read_page(pdf, page_number)))
+    return results
+
+def split_pages(page_numbers, chunks):
+    """Split a list of page numbers into at most `chunks` contiguous runs"""
+    if not page_numbers:
+        return []
+    size = -(-len(page_numbers) // max(1, chunks))
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+def count_pages(pdf_path):
+    """Return the number of pages in the PDF"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def iter_extracted(pdf_path, page_numbers, workers=1, table_mode=False, profiler=NULL_PROFILER):
+    """Yield (page_number, text) for the listed pages, extracting serially or in a pool"""
+    if not page_numbers:
+        return
+
+    if workers <= 1:
+        read_page = page_reader(table_mode)
+        with profiler.stage('pdf_open'):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            for page_number in page_numbers:
+                with profiler.stage('extract_text', page_number):
+                    text = read_page(pdf, page_number)
+                yield page_number, text
+        return
+
+    chunks = split_pages(page_numbers, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        profiler.worker_pool_started()
+        futures = [executor.submit(extract_pages, pdf_path, chunk, table_mode) for chunk in chunks]
+        # Results are consumed in submission order so the parsers still see pages in report order
+        for future in futures:
+            # With a pool, only the time spent waiting on workers is visible here
+            with profiler.stage('extract_text'):
+                results = future.result()
+            for page_number, text in results:
+                yield page_number, text
+
+def iter_page_texts(pdf_path, start_page=54, end_page=286, workers=1, cache_path=None, page_numbers=None,
+                    table_mode=False, profiler=NULL_PROFILER):
+    """
+    Yield (page_number, text) for every page from start_page to end_page
+    Page numbers are 1-based, matching the printed report; an explicit, sorted
+    page_numbers list replaces the start_page..end_page range
+    """
+    cache = None
+    if cache_path:
+        with profiler.stage('cache_open'):
+            cache = open_cache(cache_path, pdf_path, table_mode)
+    if cache is None:
+        with profiler.stage('pdf_open'):
+            page_count = count_pages(pdf_path)
+        yield from iter_extracted(pdf_path, select_pages(start_page, end_page, page_numbers, page_count), workers, table_mode,
+                                  profiler)
+        return
+    profiler.page_cache_opened()
+
+    try:
+        page_count = cache.get_page_count()
+        if page_count is None:
+            with profiler.stage('pdf_open'):
+                page_count = count_pages(pdf_path)
+            cache.put_page_count(page_count)
+        wanted = select_pages(start_page, end_page, page_numbers, page_count)
+        if not wanted:
+            return
+
+        with profiler.stage('cache_read'):
+            cached_numbers = cache.get_page_numbers(wanted[0], wanted[-1])
+        missing = [n for n in wanted if n not in cached_numbers]
+        extracted = iter_extracted(pdf_path, missing, workers, table_mode, profiler)
+
+        cached = {}
+        for page_number in wanted:
+            if page_number in cached_numbers:
+                if page_number not in cached:
+                    # Cached text is read a batch at a time so memory doesn't grow with the PDF
+                    with profiler.stage('cache_read'):
+                        cached = cache.get_pages(page_number, page_number + CACHE_READ_PAGES - 1)
+                yield page_number, cached[page_number]
+                continue
+            # Missing pages arrive in ascending order, so the next one is always this page
+            extracted_number, text = next(extracted)
+            with profiler.stage('cache_write'):
+                cache.put_pages([(extracted_number, text)])
+            yield extracted_number, text
+    finally:
+        cache.close()
+
+def select_pages(start_page, end_page, page_numbers, page_count):
+    """Page numbers to read, clipped to the document"""
+    if page_numbers is not None:
+        return [n for n in page_numbers if 1 <= n <= page_count]
+    return list(range(start_page, min(end_page, page_count) + 1))
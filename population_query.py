@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Indexed lookups over population_stats.json
+All indexes are built once at load time, so lookups by region, council, ward,
+normalized name prefix and council type are dict hits or bisect searches
+"""
+
+import bisect
+import json
+import re
+from collections import namedtuple
+
+WardRecord = namedtuple('WardRecord', ['region', 'council_type', 'council', 'name', 'population'])
+
+def normalize_name(name):
+    """
+    Comparison form of a name: lower case, with spaces, hyphens, apostrophes and dots removed
+    e.g. 'Kondoa-Mjini', 'KondoaMjini' -> 'kondoamjini'; name_matcher uses the same form
+    """
+    return re.sub(r"[\s\-'’`.]+", '', name).lower()
+
+class PopulationIndex:
+    """
+    Lookup indexes over the regions -> councils -> wards hierarchy
+    Council names are not unique within a region (e.g. Kondoa district and
+    town councils), so council lookups accept an optional council type
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.regions_by_name = {}
+        self.councils_by_name = {}
+        self.councils_by_key = {}
+        self.councils_by_type = {}
+        self.councils_by_region_type = {}
+        self.wards_by_name = {}
+        self.wards_by_key = {}
+        self.wards_by_normalized = {}
+
+        for region in data["regions"]:
+            region_name = region["region"]
+            self.regions_by_name[region_name] = region
+            for council in region["councils"]:
+                council_type = council["type"]
+                council_name = council["name"]
+                self.councils_by_name.setdefault((region_name, council_name), []).append(council)
+                self.councils_by_key[(region_name, council_type, council_name)] = council
+                self.councils_by_type.setdefault(council_type, []).append((region_name, council))
+                self.councils_by_region_type.setdefault((region_name, council_type), []).append(council)
+                for ward in council["wards"]:
+                    record = WardRecord(region_name, council_type, council_name, ward["name"], ward["population"])
+                    self.wards_by_name.setdefault(ward["name"], []).append(record)
+                    self.wards_by_key.setdefault((region_name, council_name, ward["name"]), []).append(record)
+                    self.wards_by_normalized.setdefault(normalize_name(ward["name"]), []).append(record)
+
+        # Sorted normalized names back prefix searches with bisect
+        self.sorted_names = sorted(self.wards_by_normalized)
+
+    @classmethod
+    def load(cls, path='population_stats.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def get_region(self, region_name):
+        """Return the region dict, or None"""
+        return self.regions_by_name.get(region_name)
+
+    def get_council(self, region_name, council_name, council_type=None):
+        """
+        Return the council dict, or None
+        Without council_type, the first council of that name in the region is returned
+        """
+        if council_type:
+            return self.councils_by_key.get((region_name, council_type, council_name))
+        councils = self.councils_by_name.get((region_name, council_name))
+        return councils[0] if councils else None
+
+    def get_ward(self, ward_name, council_name=None, region_name=None):
+        """
+        Return the WardRecord for a ward, or None
+        Ward names repeat across the country, so pass the council and region when known
+        """
+        if council_name and region_name:
+            records = self.wards_by_key.get((region_name, council_name, ward_name))
+        else:
+            records = [
+                record for record in self.wards_by_name.get(ward_name, ())
+                if (council_name is None or record.council == council_name)
+                and (region_name is None or record.region == region_name)
+            ]
+        return records[0] if records else None
+
+    def find_wards(self, ward_name):
+        """Return every WardRecord with exactly this name"""
+        return list(self.wards_by_name.get(ward_name, ()))
+
+    def find_wards_fuzzy(self, ward_name):
+        """Return WardRecords whose name matches ignoring case, spaces, hyphens, apostrophes and dots"""
+        return list(self.wards_by_normalized.get(normalize_name(ward_name), ()))
+
+    def search_wards(self, prefix, limit=20):
+        """Return up to `limit` WardRecords whose normalized name starts with prefix"""
+        prefix = normalize_name(prefix)
+        results = []
+        position = bisect.bisect_left(self.sorted_names, prefix)
+        while position < len(self.sorted_names) and self.sorted_names[position].startswith(prefix):
+            results.extend(self.wards_by_normalized[self.sorted_names[position]])
+            if len(results) >= limit:
+                break
+            position += 1
+        return results[:limit]
+
+    def councils_of_type(self, council_type, region_name=None):
+        """Return (region_name, council) pairs for a council type, optionally within one region"""
+        if region_name is None:
+            return list(self.councils_by_type.get(council_type, ()))
+        return [(region_name, council) for council in self.councils_by_region_type.get((region_name, council_type), ())]
+
+def load(path='population_stats.json'):
+    """Load population_stats.json and build its lookup indexes"""
+    return PopulationIndex.load(path)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Stage-level timing for the extraction scripts
+A Profiler collects wall time per stage (PDF open, text extraction, line
+classification, dedup, JSON output), per page and per region, and writes
+them as a JSON report, with peak memory, so runs can be compared for regressions
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# Pages listed in the report's slowest_pages
+SLOWEST_PAGES = 10
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident memory in MB; None where the resource module is unavailable (Windows)
+    With children, the largest peak among finished child processes, i.e. the
+    busiest --workers process, since pool workers parse the pages themselves
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+class Profiler:
+    """
+    Accumulates stage timings for one extraction run
+    Stages nest: each stage is charged only for time not spent in the stages
+    inside it, so stage times add up to at most the run's wall time
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.pages = {}
+        self.lines = 0
+        # Time spent in child stages, one entry per open stage
+        self.child_times = []
+        # Set once iter_extracted starts a --workers pool; a fully cached run never does
+        self.pool_started = False
+        # Set once iter_page_texts opens the page cache; an unusable cache is skipped with a warning
+        self.cache_opened = False
+
+    @contextmanager
+    def stage(self, name, page_number=None):
+        """Time a block as the named stage, optionally charging it to a page as well"""
+        self.child_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            exclusive = elapsed - self.child_times.pop()
+            if self.child_times:
+                self.child_times[-1] += elapsed
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stage["seconds"] += exclusive
+            stage["calls"] += 1
+            if page_number is not None:
+                page = self.page(page_number)
+                page[name] = page.get(name, 0.0) + elapsed
+
+    def worker_pool_started(self):
+        self.pool_started = True
+
+    def page_cache_opened(self):
+        self.cache_opened = True
+
+    def page(self, page_number):
+        return self.pages.setdefault(page_number, {"page": page_number})
+
+    def instrument(self, parser):
+        """
+        Time a parser's apply() as the dedup stage, and return a feed_page replacement
+        that times the rest of feed_page() as classification
+        """
+        apply = parser.apply
+
+        def timed_apply(record):
+            with self.stage('dedup'):
+                apply(record)
+
+        def timed_feed(text, page_number=None):
+            lines = text.count('\n') + 1 if text else 0
+            self.lines += lines
+            page = self.page(page_number)
+            page["lines"] = page.get("lines", 0) + lines
+            with self.stage('classify', page_number):
+                parser.feed_page(text, page_number)
+            # A page is counted towards the region the parser is in once the page is done
+            if parser.current_region:
+                page["region"] = parser.current_region["region"]
+
+        parser.apply = timed_apply
+        return timed_feed
+
+    def wrap(self, name, func):
+        """Return func timed as the named stage, e.g. a streaming writer's region callback"""
+        if func is None:
+            return None
+
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def report(self, **info):
+        """Build the JSON-able report; info is stored as-is (e.g. pdf path, workers)"""
+        wall = time.perf_counter() - self.started
+        page_count = len(self.pages)
+
+        pages = []
+        for page in self.pages.values():
+            seconds = sum(value for value in page.values() if isinstance(value, float))
+            page = {key: round(value, 6) if isinstance(value, float) else value for key, value in page.items()}
+            pages.append(dict(page, seconds=round(seconds, 6)))
+
+        regions = {}
+        for page in pages:
+            region_name = page.get("region")
+            if region_name is None:
+                continue
+            region = regions.setdefault(region_name, {"region": region_name, "pages": 0, "lines": 0, "seconds": 0.0})
+            region["pages"] += 1
+            region["lines"] += page.get("lines", 0)
+            region["seconds"] += page["seconds"]
+        for region in regions.values():
+            region["seconds"] = round(region["seconds"], 6)
+
+        return dict(
+            info,
+            cached=self.cache_opened,
+            wall_seconds=round(wall, 6),
+            pages=page_count,
+            lines=self.lines,
+            pages_per_sec=round(page_count / wall, 2) if wall else None,
+            lines_per_sec=round(self.lines / wall, 2) if wall else None,
+            peak_rss_mb=peak_rss_mb(),
+            peak_worker_rss_mb=peak_rss_mb(children=True) if self.pool_started else None,
+            stages={
+                name: {"seconds": round(stage["seconds"], 6), "calls": stage["calls"]}
+                for name, stage in self.stages.items()
+            },
+            regions=list(regions.values()),
+            slowest_pages=sorted(pages, key=lambda page: page["seconds"], reverse=True)[:SLOWEST_PAGES]
+        )
+
+    def save(self, path, **info):
+        """Write the report as JSON and return it"""
+        report = self.report(**info)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+def print_profile(report):
+    """Print the headline numbers of a profile report"""
+    print(f"Wall time: {report['wall_seconds']:.2f}s, {report['pages_per_sec']:,.1f} pages/sec, "
+          f"{report['lines_per_sec']:,.0f} lines/sec")
+    if report.get('peak_rss_mb') is not None:
+        workers = f", largest worker {report['peak_worker_rss_mb']:,.1f} MB" if report.get('peak_worker_rss_mb') is not None else ""
+        print(f"Peak RSS: {report['peak_rss_mb']:,.1f} MB{workers}")
+    for name, stage in sorted(report["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True):
+        print(f"  {name:<14} {stage['seconds']:>9.3f}s  ({stage['calls']:,} calls)")
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every stage is a no-op"""
+
+    def stage(self, name, page_number=None):
+        return nullcontext()
+
+    def worker_pool_started(self):
+        pass
+
+    def page_cache_opened(self):
+        pass
+
+    def instrument(self, parser):
+        return parser.feed_page
+
+    def wrap(self, name, func):
+        return func
+
+NULL_PROFILER = NullProfiler()
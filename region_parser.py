@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Shared parser base and command-line options for the extraction scripts
+RegionParser holds the region/council/ward bookkeeping both parsers need:
+dedup indexes, page numbers, record/replay for incremental runs and handing
+finished regions to a streaming writer. Subclasses classify the lines of a
+page and define the shape of a region, council and ward
+"""
+
+from page_cache import default_cache_path
+from page_index import select_region_pages, only_regions, filter_regions
+from pdf_pages import iter_page_texts
+from profiler import NULL_PROFILER
+
+DEFAULT_PDF = '/home/runner/work/TZ-AU-DS-2022/TZ-AU-DS-2022/Administrative_units_Population_Distribution_Report_Tanzania_volume1a.pdf'
+
+class RegionParser:
+    """
+    Line-level state machine that builds a regions/councils/wards hierarchy
+    Pages are fed in report order, so one reader can drive several parsers
+
+    Every state change goes through apply() as a small JSON-able record
+    (["region", name], ["council", type, name], ["ward", name, ...] plus any
+    kinds a subclass adds), so the records a page produced can be saved and
+    replayed without re-parsing it
+    """
+
+    # Top-level fields written before the regions list
+    DATA_HEADER = {}
+    # Key of a region's list of councils
+    COUNCILS = "councils"
+
+    def __init__(self, on_region_complete=None, source_pages=None):
+        self.data = dict(self.DATA_HEADER, regions=[])
+        self.current_region = None
+        self.current_council = None
+        self.current_council_key = None
+        self.current_ward_names = None
+        # Dedup indexes kept next to the output lists, so lookups don't scan them
+        self.regions_by_name = {}
+        self.councils_by_key = {}
+        self.ward_names_by_council = {}
+        # Completed regions are handed to on_region_complete and dropped from data
+        self.on_region_complete = on_region_complete
+        self.completed_regions = set()
+        # Page each region, council and ward was first seen on; callers may pass their own dict
+        self.page_number = None
+        self.source_pages = {} if source_pages is None else source_pages
+        # Records emitted while parsing, when record_page() has switched recording on
+        self.records = None
+
+    def feed_page(self, text, page_number=None):
+        """Parse the extracted text of one page"""
+        raise NotImplementedError
+
+    def new_region(self, region_name):
+        """Return an empty region dict"""
+        raise NotImplementedError
+
+    def new_council(self, council_type, council_name):
+        """Return an empty council dict"""
+        raise NotImplementedError
+
+    def council_id(self, council):
+        """Return (council_type, council_name) of a council dict"""
+        raise NotImplementedError
+
+    def new_ward(self, record):
+        """Return the ward entry for a ["ward", name, ...] record"""
+        raise NotImplementedError
+
+    def apply_other(self, record):
+        """Apply a record kind the subclass adds"""
+        raise ValueError(f"Unknown record kind {record[0]!r}")
+
+    def record_page(self, text, page_number=None):
+        """Parse one page and return the records it produced"""
+        self.records = []
+        try:
+            self.feed_page(text, page_number)
+            return self.records
+        finally:
+            self.records = None
+
+    def replay_page(self, records, page_number=None):
+        """Apply records saved from an earlier parse of a page"""
+        self.page_number = page_number
+        for record in records:
+            self.apply(record)
+
+    def state_key(self):
+        """Parser state that a page's records depend on: the current region and council"""
+        if self.current_council_key is not None:
+            return list(self.current_council_key)
+        return [self.current_region["region"] if self.current_region else None, None, None]
+
+    def emit(self, record):
+        if self.records is not None:
+            self.records.append(record)
+        self.apply(record)
+
+    def apply(self, record):
+        """Apply one record to the output and the current region/council"""
+        kind = record[0]
+
+        if kind == "region":
+            region_name = record[1]
+
+            if self.current_region is not None and self.current_region["region"] != region_name:
+                self.complete_region(self.current_region)
+
+            if region_name in self.completed_regions:
+                raise ValueError(f"Region {region_name} reappeared after it was written; rerun without streaming")
+
+            # Check if region already exists
+            existing_region = self.regions_by_name.get(region_name)
+
+            if not existing_region:
+                self.current_region = self.new_region(region_name)
+                self.data["regions"].append(self.current_region)
+                self.regions_by_name[region_name] = self.current_region
+                self.source_pages[("region", region_name)] = self.page_number
+                print(f"Found region: {region_name}")
+            else:
+                self.current_region = existing_region
+
+            self.current_council = None
+            self.current_council_key = None
+            self.current_ward_names = None
+
+        elif kind == "council":
+            council_type, council_name = record[1], record[2]
+
+            # Check if council already exists
+            council_key = (self.current_region["region"], council_type, council_name)
+            existing_council = self.councils_by_key.get(council_key)
+
+            if not existing_council:
+                self.current_council = self.new_council(council_type, council_name)
+                self.current_region[self.COUNCILS].append(self.current_council)
+                self.councils_by_key[council_key] = self.current_council
+                self.ward_names_by_council[council_key] = set()
+                self.source_pages[("council",) + council_key] = self.page_number
+                print(f"  Found {council_type}: {council_name}")
+            else:
+                self.current_council = existing_council
+            self.current_council_key = council_key
+            self.current_ward_names = self.ward_names_by_council[council_key]
+
+        elif kind == "ward":
+            ward_name = record[1]
+
+            if ward_name not in self.current_ward_names:
+                self.current_ward_names.add(ward_name)
+                self.current_council["wards"].append(self.new_ward(record))
+                self.source_pages[("ward",) + self.current_council_key + (ward_name,)] = self.page_number
+
+        else:
+            self.apply_other(record)
+
+    def complete_region(self, region):
+        """Hand a finished region to on_region_complete and release it"""
+        if self.on_region_complete is None:
+            return
+
+        self.on_region_complete(region)
+        self.data["regions"].remove(region)
+        self.completed_regions.add(region["region"])
+        del self.regions_by_name[region["region"]]
+        for council in region[self.COUNCILS]:
+            council_key = (region["region"],) + self.council_id(council)
+            del self.councils_by_key[council_key]
+            del self.ward_names_by_council[council_key]
+
+    def finish(self):
+        """Complete the last region once every page has been fed"""
+        if self.current_region is not None:
+            self.complete_region(self.current_region)
+            self.current_region = None
+            self.current_council = None
+            self.current_council_key = None
+            self.current_ward_names = None
+
+def extract_regions(parser_class, pdf_path, start_page=54, end_page=286, workers=1, cache_path=None,
+                    on_region_complete=None, regions=None, table_mode=False, source_pages=None,
+                    profiler=NULL_PROFILER, page_numbers=None):
+    """
+    Run one RegionParser subclass over the PDF and return its data
+    With regions, page_numbers are their pages if already resolved (see page_index.resolve_region_option)
+    """
+    if regions and page_numbers is None:
+        # Only read the pages of the requested regions
+        with profiler.stage('region_index'):
+            regions, page_numbers = select_region_pages(pdf_path, regions, start_page, end_page)
+    if regions:
+        on_region_complete = only_regions(regions, on_region_complete)
+
+    parser = parser_class(on_region_complete, source_pages)
+    feed_page = profiler.instrument(parser)
+
+    for page_number, text in iter_page_texts(pdf_path, start_page, end_page, workers=workers, cache_path=cache_path,
+                                             page_numbers=page_numbers, table_mode=table_mode, profiler=profiler):
+        feed_page(text, page_number)
+
+    parser.finish()
+    if regions:
+        filter_regions(parser, regions)
+    return parser.data
+
+def add_extraction_arguments(parser, profile=True, columns=False):
+    """
+    Add the options every extraction script shares; with profile, --profile,
+    and with columns, --columns and --validate. Output paths are added by the caller
+    """
+    parser.add_argument('--pdf', default=DEFAULT_PDF)
+    parser.add_argument('--workers', type=int, default=1, help='Processes used for page text extraction')
+    parser.add_argument('--cache', help='Page-text cache file (default: next to the PDF)')
+    parser.add_argument('--no-cache', action='store_true', help='Always extract text from the PDF')
+    parser.add_argument('--stream', action='store_true', help='Write each region to the output as soon as it is complete')
+    parser.add_argument('--ndjson', action='store_true', help='Write one ward per line (implies --stream)')
+    parser.add_argument('--region', action='append', help='Only extract this region (repeatable, or comma-separated)')
+    parser.add_argument('--table-mode', action='store_true',
+                        help='Split ward rows into cells by word position instead of re-parsing text lines')
+    if profile:
+        parser.add_argument('--profile', nargs='?', const='profile.json',
+                            help='Write a JSON report of per-stage timings (default: profile.json)')
+    if columns:
+        parser.add_argument('--columns', help='Also write a memory-mappable columnar export to this directory')
+        parser.add_argument('--validate', action='store_true',
+                            help='Check that the extracted statistics add up; exit with status 1 on mismatches')
+
+def check_extraction_arguments(parser, args):
+    """Reject option combinations add_extraction_arguments' options don't support"""
+    streaming = args.stream or args.ndjson
+    if getattr(args, 'columns', None) and streaming:
+        parser.error('--columns needs the full dataset in memory and cannot be combined with --stream/--ndjson')
+    if getattr(args, 'validate', False) and streaming:
+        parser.error('--validate needs the full dataset in memory and cannot be combined with --stream/--ndjson')
+
+def cache_path_option(args):
+    """Page-cache path chosen by --cache/--no-cache, or None to run without a cache"""
+    return None if args.no_cache else (args.cache or default_cache_path(args.pdf))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Synthetic census-report PDF generator
+Lays population_stats.json out the way the report does ("Table N.0 ... by
+Council, <Region> Region; 2022 PHC" headers, "N.M <NAME> DISTRICT COUNCIL"
+sections and numbered ward rows) so the extractors can be benchmarked at any
+size without the source PDF. Scale N repeats every region N times under new
+names. The PDF is written object by object with the built-in Courier font,
+so no PDF library is needed
+"""
+
+import argparse
+import json
+
+from line_classifier import STAT_FIELDS
+
+# Pages before the data tables, so the first table lands on page 54 like the report
+FRONT_MATTER_PAGES = 53
+LINES_PER_PAGE = 60
+
+COUNCIL_TYPE_NAMES = {
+    'district_council': 'DISTRICT COUNCIL',
+    'municipal_council': 'MUNICIPAL COUNCIL',
+    'town_council': 'TOWN COUNCIL',
+    'city_council': 'CITY COUNCIL',
+}
+
+# Page geometry in points: 7pt Courier is 4.2pt per character, on a 9pt line pitch
+FONT_SIZE = 7
+CHAR_WIDTH = 4.2
+LINE_HEIGHT = 9
+LEFT_MARGIN = 20
+TOP_LINE = 770
+# Right edges of the six statistics columns in the table layout
+COLUMN_EDGES = (250, 300, 350, 390, 440, 490)
+# In the table layout, every WRAP_EVERY-th ward with a two-word name is wrapped onto two lines
+WRAP_EVERY = 3
+
+def format_value(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f"{value}"
+    return f"{value:,}"
+
+def stat_cells(population):
+    return [format_value((population or {}).get(field)) for field in STAT_FIELDS]
+
+# Letters for region-name suffixes; no Y, since the parsers reject region names containing "by"
+SUFFIX_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXZ'
+
+def copy_suffix(copy):
+    """Letters appended to region names for each extra copy: '', ' A', ..., ' Z', ' AA', ..."""
+    if copy == 0:
+        return ''
+    letters = ''
+    while copy > 0:
+        copy, remainder = divmod(copy - 1, len(SUFFIX_LETTERS))
+        letters = SUFFIX_LETTERS[remainder] + letters
+    return ' ' + letters
+
+def report_rows(data, scale=1, wrap_names=False):
+    """
+    Yield the report's rows as (label, cells) pairs, with None between tables
+    cells is None for rows without statistics; wrap_names splits some ward names over two rows
+    """
+    table_number = 0
+    for copy in range(scale):
+        for region in data["regions"]:
+            table_number += 1
+            region_name = region["region"] + copy_suffix(copy)
+            yield None
+            yield (f"Table {table_number}.0: Population Distribution by Sex, Number of Households and "
+                   f"Average Household Size by Council, {region_name}", None)
+            yield ("Region; 2022 PHC", None)
+            yield ("Council Both Sexes Male Female Sex Ratio Households Average Household Size", None)
+            yield (f"{region_name} Region", stat_cells(region.get("population")))
+
+            for council_number, council in enumerate(region["councils"], 1):
+                type_name = COUNCIL_TYPE_NAMES[council["type"]]
+                yield None
+                yield (f"{table_number}.{council_number} {council['name'].upper()} {type_name}", None)
+                yield (f"{council['name']} {type_name.title()}", stat_cells(council.get("population")))
+
+                for ward_number, ward in enumerate(council["wards"], 1):
+                    cells = stat_cells(ward["population"])
+                    first, _, rest = ward["name"].partition(' ')
+                    if wrap_names and rest and ward_number % WRAP_EVERY == 0:
+                        # The wrapped part sits under the name, not under the ward number
+                        rest = ' ' * len(f"{ward_number}. ") + rest
+                        # Alternate between numbers on the first and on the second line
+                        if ward_number % 2:
+                            yield (f"{ward_number}. {first}", cells)
+                            yield (rest, None)
+                        else:
+                            yield (f"{ward_number}. {first}", None)
+                            yield (rest, cells)
+                    else:
+                        yield (f"{ward_number}. {ward['name']}", cells)
+
+def paginate(rows):
+    """Group rows into pages: front matter first, then a new page per table or every LINES_PER_PAGE rows"""
+    pages = [[(f"Front matter page {number}", None)] for number in range(1, FRONT_MATTER_PAGES + 1)]
+    page = []
+    for row in rows:
+        if row is None:
+            if page:
+                pages.append(page)
+                page = []
+            continue
+        page.append(row)
+        if len(page) >= LINES_PER_PAGE:
+            pages.append(page)
+            page = []
+    if page:
+        pages.append(page)
+    return pages
+
+def escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def page_content(rows, table_layout):
+    """Content stream for one page; the table layout right-aligns cells on COLUMN_EDGES"""
+    commands = [f"BT /F1 {FONT_SIZE} Tf"]
+    y = TOP_LINE
+    for label, cells in rows:
+        if table_layout:
+            commands.append(f"1 0 0 1 {LEFT_MARGIN} {y} Tm ({escape(label)}) Tj")
+            for edge, cell in zip(COLUMN_EDGES, cells or []):
+                commands.append(f"1 0 0 1 {edge - len(cell) * CHAR_WIDTH:.1f} {y} Tm ({escape(cell)}) Tj")
+        else:
+            text = ' '.join([label] + (cells or []))
+            commands.append(f"1 0 0 1 {LEFT_MARGIN} {y} Tm ({escape(text)}) Tj")
+        y -= LINE_HEIGHT
+    commands.append("ET")
+    return '\n'.join(commands).encode('cp1252', errors='replace')
+
+def write_pdf(pages, output_path, table_layout=False):
+    """
+    Write pages of rows as a PDF, one object at a time
+    Object 1 is the font, then a content stream and page object per page,
+    then the page tree and the catalog
+    """
+    pages_id = 2 + 2 * len(pages)
+    catalog_id = pages_id + 1
+    offsets = []
+
+    with open(output_path, 'wb') as f:
+        def write_object(body):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % len(offsets) + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        write_object(b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+        for rows in pages:
+            stream = page_content(rows, table_layout)
+            write_object(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+            write_object(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 1 0 R >> >> /Contents %d 0 R >>" % (pages_id, len(offsets))
+            )
+        kids = ' '.join(f"{2 + 2 * i + 1} 0 R" for i in range(len(pages)))
+        write_object(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+        write_object(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets) + 1, catalog_id, xref_offset))
+
+def generate(data, output_path, scale=1, table_layout=False):
+    """Write a synthetic report for population_stats data and return its page count"""
+    pages = paginate(report_rows(data, scale, wrap_names=table_layout))
+    write_pdf(pages, output_path, table_layout)
+    return len(pages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic census report PDF from population_stats.json")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--output', default='synthetic_report.pdf')
+    parser.add_argument('--scale', type=int, default=1, help='Number of copies of every region')
+    parser.add_argument('--table-layout', action='store_true',
+                        help='Right-align statistics in fixed columns and wrap some ward names over two lines')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    page_count = generate(data, args.output, args.scale, args.table_layout)
+
+    print(f"Pages: {page_count} ({args.scale}x)")
+    print(f"\n✓ PDF saved to: {args.output}")
+
+if __name__ == '__main__':
+    main()
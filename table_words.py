@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Word-coordinate table reader for the census report
+Instead of re-splitting extract_text() lines with regexes, ward rows are built
+from page.extract_words(): the right edges of the six statistics columns are
+learned once per table and reused on its continuation pages, each word is
+assigned to a cell by its x-position, and ward names wrapped onto a second
+line are merged back
+"""
+
+import re
+from statistics import median
+
+from line_classifier import CELL_SEPARATOR
+
+STATS_CELLS = 6
+
+# Points between word tops on the same row, and between a number's right edge and its column
+ROW_TOLERANCE = 3
+COLUMN_TOLERANCE = 4
+
+# Rows needed to learn a layout, and the share of them that must line up with it
+MIN_LAYOUT_ROWS = 3
+MIN_ALIGNED_SHARE = 0.8
+
+# Pages searched backwards for the header of the table a continuation page belongs to
+MAX_HEADER_LOOKBACK = 8
+
+NUMBER_CELL = re.compile(r'^(?:[\d,]+(?:\.\d+)?|-)$')
+# "12." starts a ward row; "14.1" (a council header) does not
+WARD_INDEX = re.compile(r'^(\d+)\.(\D.*)?$')
+# First words of lines under a table that are never part of a wrapped ward name
+CAPTION_WORDS = {'source', 'sources', 'note', 'notes', 'table', 'figure', 'total', 'key'}
+
+def group_rows(words):
+    """Group extract_words() output into rows of words, top to bottom and left to right"""
+    rows = []
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if rows and abs(word['top'] - rows[-1][0]['top']) <= ROW_TOLERANCE:
+            rows[-1].append(word)
+        else:
+            rows.append([word])
+    for row in rows:
+        row.sort(key=lambda w: w['x0'])
+    return rows
+
+def row_text(words):
+    return ' '.join(word['text'] for word in words)
+
+class TableLayout:
+    """Right edges of the statistics columns, and the x-position where the name column ends"""
+
+    def __init__(self, column_edges, name_limit):
+        self.column_edges = column_edges
+        self.name_limit = name_limit
+
+    @classmethod
+    def learn(cls, rows):
+        """
+        Learn a layout from rows that end in six numbers, or return None if the
+        page has too few of them or their numbers don't line up in columns
+        """
+        samples = []
+        for row in rows:
+            if len(row) > STATS_CELLS and all(NUMBER_CELL.match(word['text']) for word in row[-STATS_CELLS:]):
+                samples.append(row[-STATS_CELLS:])
+        if len(samples) < MIN_LAYOUT_ROWS:
+            return None
+
+        column_edges = [median(cells[i]['x1'] for cells in samples) for i in range(STATS_CELLS)]
+        aligned = sum(
+            all(abs(cell['x1'] - edge) <= COLUMN_TOLERANCE for cell, edge in zip(cells, column_edges))
+            for cells in samples
+        )
+        if aligned < MIN_ALIGNED_SHARE * len(samples):
+            return None
+
+        name_limit = min(cells[0]['x0'] for cells in samples) - COLUMN_TOLERANCE
+        return cls(column_edges, name_limit)
+
+    def column_for(self, word):
+        """Index of the statistics column whose right edge the word lines up with, or None"""
+        for i, edge in enumerate(self.column_edges):
+            if abs(word['x1'] - edge) <= COLUMN_TOLERANCE:
+                return i
+        return None
+
+    def assign(self, row):
+        """
+        Split a row into (name_words, cells), or return None if it isn't a table row
+        cells holds one string per statistics column, '' where the row has no value
+        """
+        name_words = []
+        cells = [''] * STATS_CELLS
+        for word in row:
+            if word['x1'] <= self.name_limit:
+                name_words.append(word)
+                continue
+            column = self.column_for(word)
+            if column is None or cells[column] or not NUMBER_CELL.match(word['text']):
+                return None
+            cells[column] = word['text']
+        return name_words, cells
+
+class LayoutCache:
+    """
+    Column layout in effect for each page of a run
+    A layout belongs to the table that starts at a header page: it is learned from
+    the header page, or the first page after it with enough rows, and reused on its
+    continuation pages. A page's layout therefore depends only on the pages back to
+    its header, and a run (or pool chunk) that starts mid-table looks back for it
+    """
+
+    def __init__(self):
+        self.page_number = None
+        self.header_page = None
+        self.layout = None
+
+    def layout_for(self, page_number, rows):
+        """Layout for the page after the last one seen, or None if no layout fits"""
+        if is_header_page(rows):
+            self.header_page = page_number
+            self.layout = None
+        elif self.header_page is not None and page_number - self.header_page > MAX_HEADER_LOOKBACK:
+            self.header_page = None
+            self.layout = None
+        self.page_number = page_number
+
+        if self.header_page is None:
+            return TableLayout.learn(rows)
+        if self.layout is None:
+            self.layout = TableLayout.learn(rows)
+        return self.layout
+
+    def catch_up(self, pdf, page_number):
+        """Rebuild the state for page_number from the pages before it, back to its table header"""
+        self.page_number = self.header_page = self.layout = None
+        earlier = []
+        for number in range(page_number - 1, max(0, page_number - 1 - MAX_HEADER_LOOKBACK), -1):
+            rows = page_rows(pdf, number)
+            earlier.append((number, rows))
+            if is_header_page(rows):
+                break
+        else:
+            # No header close enough: the page is read as if it started the run
+            return
+        for number, rows in reversed(earlier):
+            self.layout_for(number, rows)
+
+def is_header_page(rows):
+    return any(word['text'] == 'Households' for row in rows for word in row)
+
+def page_rows(pdf, page_number):
+    """Word rows of a 1-based page; the page is closed once its words are read"""
+    page = pdf.pages[page_number - 1]
+    try:
+        return group_rows(page.extract_words())
+    finally:
+        page.close()
+
+def is_caption(word):
+    """True for the first word of a note, source line or caption under a table"""
+    return word.rstrip(':.').lower() in CAPTION_WORDS
+
+def name_start(name_words, index_match):
+    """x-position where a ward row's name starts, after its "12." index"""
+    first = name_words[0]
+    if index_match.group(2):
+        # "12.Kibaha" is one word; estimate where the name starts inside it
+        share = (len(first['text']) - len(index_match.group(2))) / len(first['text'])
+        return first['x0'] + share * (first['x1'] - first['x0'])
+    return name_words[1]['x0'] if len(name_words) > 1 else first['x1']
+
+def ward_line(index, name, cells):
+    return CELL_SEPARATOR.join([index, name] + cells)
+
+def table_lines(rows, layout):
+    """
+    Render rows as text lines, writing ward rows as pre-split cells
+    A ward name wrapped onto a second line is merged whether the numbers sit on
+    the first line ("12. Kibaha" + numbers, then "Mjini") or the second
+    ("12. Kibaha", then "Mjini" + numbers)
+    """
+    lines = []
+    # [index, name, cells, top, bottom, name_x0] of the ward row on the previous line
+    last_ward = None
+    # (index, name, name_x0) of a numbered row still waiting for its numbers
+    pending = None
+
+    for row in rows:
+        assigned = layout.assign(row)
+        if assigned is None:
+            lines.append(row_text(row))
+            last_ward = pending = None
+            continue
+
+        name_words, cells = assigned
+        name = row_text(name_words)
+        index_match = WARD_INDEX.match(name_words[0]['text']) if name_words else None
+        top = min(word['top'] for word in row)
+        bottom = max(word['bottom'] for word in row)
+
+        if index_match:
+            if pending:
+                lines.append(f"{pending[0]}. {pending[1]}")
+            index = index_match.group(1)
+            ward_name = ' '.join(filter(None, [index_match.group(2), row_text(name_words[1:])]))
+            name_x0 = name_start(name_words, index_match)
+            if any(cells):
+                last_ward = [index, ward_name, cells, top, bottom, name_x0]
+                lines.append(last_ward)
+                pending = None
+            else:
+                last_ward = None
+                pending = (index, ward_name, name_x0)
+            continue
+
+        if pending and any(cells) and name:
+            last_ward = [pending[0], f"{pending[1]} {name}", cells, top, bottom, pending[2]]
+            lines.append(last_ward)
+            pending = None
+            continue
+
+        # A name-only line right under a ward row, indented to the ward name,
+        # continues that name; footnotes and captions start further left or
+        # with a word such as "Source"
+        if (last_ward and not any(cells) and name[:1].isalpha()
+                and top - last_ward[4] <= last_ward[4] - last_ward[3]
+                and name_words[0]['x0'] >= last_ward[5] - COLUMN_TOLERANCE
+                and not is_caption(name_words[0]['text'])):
+            last_ward[1] = f"{last_ward[1]} {name}"
+            last_ward[4] = bottom
+            continue
+
+        if pending:
+            lines.append(f"{pending[0]}. {pending[1]}")
+        lines.append(row_text(row))
+        last_ward = pending = None
+
+    if pending:
+        lines.append(f"{pending[0]}. {pending[1]}")
+
+    return '\n'.join(
+        ward_line(line[0], line[1], line[2]) if isinstance(line, list) else line
+        for line in lines
+    )
+
+def table_page_text(pdf, page_number, layouts):
+    """
+    Text of a 1-based page with ward rows split into cells by word position
+    Falls back to page.extract_text() when no column layout fits the page
+    """
+    if layouts.page_number != page_number - 1:
+        layouts.catch_up(pdf, page_number)
+    page = pdf.pages[page_number - 1]
+    try:
+        rows = group_rows(page.extract_words())
+        layout = layouts.layout_for(page_number, rows)
+        if layout is None:
+            return page.extract_text()
+        return table_lines(rows, layout)
+    finally:
+        page.close()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for extracted population statistics
+Runs over the columnar arrays from columnar_export.py in one vectorized pass:
+wards must add up to their council, councils to their region, male + female
+to both sexes, and the sex ratio must agree with male/female
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from columnar_export import build_columns, export_columns, load_columns
+from line_classifier import SUM_FIELDS
+
+# The report rounds sex ratios to whole numbers
+SEX_RATIO_TOLERANCE = 1.0
+
+def child_sums(columns, child_level, parent_level, field):
+    """
+    Sum a child column into its parents
+    Returns (sums, complete): complete is False for parents with no children or
+    with a child whose value is missing, where the sum can't be compared
+    """
+    parent_count = len(columns[f"{parent_level}_name"])
+    codes = columns[f"{child_level}_{parent_level}_code"]
+    values = columns[f"{child_level}_{field}"]
+    present = values >= 0
+    sums = np.bincount(codes, weights=np.where(present, values, 0), minlength=parent_count)
+    children = np.bincount(codes, minlength=parent_count)
+    missing = np.bincount(codes, weights=~present, minlength=parent_count)
+    return sums.astype(np.int64), (children > 0) & (missing == 0)
+
+def check_sums(columns, child_level, parent_level):
+    """Yield (check, level, index, field, expected, actual) where children don't add up to their parent"""
+    for field in SUM_FIELDS:
+        sums, complete = child_sums(columns, child_level, parent_level, field)
+        totals = columns[f"{parent_level}_{field}"]
+        for index in np.flatnonzero(complete & (totals >= 0) & (sums != totals)):
+            yield f"{child_level}_sum", parent_level, index, field, int(totals[index]), int(sums[index])
+
+def check_sexes(columns, level):
+    """Yield mismatches of male + female against both sexes, and of the sex ratio against male/female"""
+    both = columns[f"{level}_both_sexes"]
+    male = columns[f"{level}_male"]
+    female = columns[f"{level}_female"]
+    ratio = columns[f"{level}_sex_ratio"]
+    present = (both >= 0) & (male >= 0) & (female >= 0)
+
+    for index in np.flatnonzero(present & (male + female != both)):
+        yield "sex_total", level, index, "both_sexes", int(both[index]), int(male[index] + female[index])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        computed = 100.0 * male / female
+    for index in np.flatnonzero(present & (female > 0) & (ratio >= 0) & (np.abs(computed - ratio) > SEX_RATIO_TOLERANCE)):
+        yield "sex_ratio", level, index, "sex_ratio", int(ratio[index]), round(float(computed[index]), 1)
+
+def unit_name(columns, strings, level, index):
+    """Readable path to a unit, e.g. 'Dodoma / Kondoa (town_council) / Kolo'"""
+    if level == 'region':
+        return strings[columns['region_name'][index]]
+    if level == 'council':
+        region_name = strings[columns['region_name'][columns['council_region_code'][index]]]
+        return f"{region_name} / {strings[columns['council_name'][index]]} ({strings[columns['council_type'][index]]})"
+    council_code = columns['ward_council_code'][index]
+    return f"{unit_name(columns, strings, 'council', council_code)} / {strings[columns['ward_name'][index]]}"
+
+def validate_columns(columns, strings):
+    """
+    Run every check and return a list of mismatches, each a dict with check,
+    level, unit, field, expected (as printed in the report), actual (as computed)
+    and page (None when the columns carry no page numbers)
+    """
+    found = []
+    found.extend(check_sums(columns, 'ward', 'council'))
+    found.extend(check_sums(columns, 'council', 'region'))
+    for level in ('region', 'council', 'ward'):
+        found.extend(check_sexes(columns, level))
+
+    mismatches = []
+    for check, level, index, field, expected, actual in found:
+        pages = columns.get(f"{level}_page")
+        page = int(pages[index]) if pages is not None and pages[index] >= 0 else None
+        mismatches.append({
+            "check": check,
+            "level": level,
+            "unit": unit_name(columns, strings, level, index),
+            "field": field,
+            "expected": expected,
+            "actual": actual,
+            "page": page
+        })
+    return mismatches
+
+def validate_stats(data, source_pages=None):
+    """Validate population_stats data, with page numbers when the parser's source_pages are given"""
+    columns, strings = build_columns(data, source_pages)
+    return validate_columns(columns, strings)
+
+def print_report(mismatches, elapsed=None):
+    """Print one line per mismatch followed by a count per check"""
+    for mismatch in mismatches:
+        page = f" page {mismatch['page']}" if mismatch['page'] is not None else ""
+        print(f"  [{mismatch['check']}]{page}: {mismatch['unit']} {mismatch['field']}: "
+              f"report {mismatch['expected']:,}, computed {mismatch['actual']:,}")
+
+    counts = {}
+    for mismatch in mismatches:
+        counts[mismatch['check']] = counts.get(mismatch['check'], 0) + 1
+    summary = ', '.join(f"{check}: {count}" for check, count in counts.items()) or 'none'
+    timing = f" in {elapsed * 1000:.1f} ms" if elapsed is not None else ""
+    print(f"\nValidation{timing}: {len(mismatches)} mismatches ({summary})")
+
+def run_columns_and_validation(data, source_pages, columns_dir=None, validate=False):
+    """
+    The extractors' --columns export and --validate check
+    Validation reuses the exported columns, and only the vectorized checks are
+    timed; returns the mismatches (empty when validate is False)
+    """
+    columns = None
+    if columns_dir:
+        columns = export_columns(data, columns_dir, source_pages)
+        print(f"✓ Columns saved to: {columns_dir}")
+
+    mismatches = []
+    if validate:
+        print("\nValidating extracted statistics...")
+        columns, strings = columns or build_columns(data, source_pages)
+        start = time.perf_counter()
+        mismatches = validate_columns(columns, strings)
+        print_report(mismatches, time.perf_counter() - start)
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that extracted population statistics add up")
+    parser.add_argument('--input', default='population_stats.json')
+    parser.add_argument('--columns', help='Validate a columnar export directory instead of the JSON file')
+    parser.add_argument('--output', help='Also write the mismatches to this JSON file')
+    args = parser.parse_args()
+
+    if args.columns:
+        columns, strings = load_columns(args.columns)
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            columns, strings = build_columns(json.load(f))
+
+    start = time.perf_counter()
+    mismatches = validate_columns(columns, strings)
+    elapsed = time.perf_counter() - start
+
+    print_report(mismatches, elapsed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(mismatches, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ Mismatches saved to: {args.output}")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()